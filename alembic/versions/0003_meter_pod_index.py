@@ -0,0 +1,25 @@
+"""meter pod index
+
+Revision ID: 0003_meter_pod_index
+Revises: 0002_community_revision
+Create Date: 2026-10-17 10:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_meter_pod_index"
+down_revision = "0002_community_revision"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_meter_pod", "meter", ["pod"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_meter_pod", table_name="meter")
@@ -0,0 +1,30 @@
+"""hash indexes on entity iri columns
+
+Revision ID: 0004_iri_hash_indexes
+Revises: 0003_meter_pod_index
+Create Date: 2026-10-17 11:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004_iri_hash_indexes"
+down_revision = "0003_meter_pod_index"
+branch_labels = None
+depends_on = None
+
+# community.iri is already covered by its unique constraint
+TABLES = ["participant", "membership", "site", "asset", "meter"]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.create_index(f"ix_{table}_iri", table, ["iri"], postgresql_using="hash")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_iri", table_name=table)
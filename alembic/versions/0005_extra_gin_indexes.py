@@ -0,0 +1,36 @@
+"""gin indexes on extra for containment filters
+
+Revision ID: 0005_extra_gin_indexes
+Revises: 0004_iri_hash_indexes
+Create Date: 2026-10-17 12:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005_extra_gin_indexes"
+down_revision = "0004_iri_hash_indexes"
+branch_labels = None
+depends_on = None
+
+TABLES = ["community", "participant", "membership", "site", "asset", "meter"]
+
+
+def upgrade() -> None:
+    # jsonb_path_ops: smaller and faster than the default opclass, supports @> only
+    for table in TABLES:
+        op.create_index(
+            f"ix_{table}_extra",
+            table,
+            ["extra"],
+            postgresql_using="gin",
+            postgresql_ops={"extra": "jsonb_path_ops"},
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_extra", table_name=table)
@@ -0,0 +1,43 @@
+"""pg_trgm indexes for /search
+
+Revision ID: 0006_search_trgm_indexes
+Revises: 0005_extra_gin_indexes
+Create Date: 2026-10-17 13:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006_search_trgm_indexes"
+down_revision = "0005_extra_gin_indexes"
+branch_labels = None
+depends_on = None
+
+# Searched columns, see services/search.py
+COLUMNS = {
+    "participant": ["name", "key"],
+    "site": ["name", "area", "key"],
+    "meter": ["name", "key", "pod"],
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, columns in COLUMNS.items():
+        for column in columns:
+            op.create_index(
+                f"ix_{table}_{column}_trgm",
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+
+
+def downgrade() -> None:
+    for table, columns in COLUMNS.items():
+        for column in columns:
+            op.drop_index(f"ix_{table}_{column}_trgm", table_name=table)
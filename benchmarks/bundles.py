@@ -0,0 +1,180 @@
+"""
+Synthetic registry bundles for benchmarks.
+
+Bundles are deterministic for a given seed and valid ``RegistryBundleIn``
+payloads: every reference resolves, ``extra`` carries the kind of metadata real
+bundles do (contacts, tags, ``datasets`` lists) and a small share of meters are
+placeholders without ``sensor_id`` so the importer's warning path is exercised.
+
+Usage:
+    python -m benchmarks.bundles --entities 10000 [--key bench] [--seed 0] > bundle.yaml
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from typing import Any
+
+from celine.rec_registry.core.yaml_io import dump_yaml
+
+# Share of the entity total per collection
+MIX = {
+    "participants": 0.2,
+    "memberships": 0.2,
+    "sites": 0.1,
+    "assets": 0.1,
+    "meters": 0.4,
+}
+
+# One meter in PLACEHOLDER_EVERY has no sensor_id (skipped with a warning)
+PLACEHOLDER_EVERY = 50
+
+_KINDS = ["household", "household", "household", "business", "public_body"]
+_ROLES = ["celine:Consumer", "celine:Prosumer", "celine:Producer"]
+_AREAS = ["Trento", "Rovereto", "Pergine", "Arco", "Riva del Garda"]
+_CATEGORIES = ["celine:PV", "celine:Battery", "celine:HeatPump", "celine:EVCharger"]
+_TAGS = ["pilot", "low-income", "school", "industrial", "rural", "vulnerable"]
+_QUANTITIES = [
+    ("active_energy", "kWh"),
+    ("reactive_energy", "kvarh"),
+    ("active_power", "kW"),
+]
+
+
+def counts(entities: int) -> dict[str, int]:
+    """
+    Split an entity total across collections per ``MIX`` (at least one each).
+    """
+    return {name: max(1, int(entities * share)) for name, share in MIX.items()}
+
+
+def _datasets(rng: random.Random, prefix: str, n: int) -> list[dict[str, Any]]:
+    out = []
+    for i in range(n):
+        quantity, unit = rng.choice(_QUANTITIES)
+        out.append(
+            {
+                "id": f"{prefix}-{quantity}-{i}",
+                "title": f"{quantity.replace('_', ' ')} ({unit})",
+                "kind": quantity,
+                "unit": unit,
+                "resolution": rng.choice(["PT15M", "PT1H"]),
+            }
+        )
+    return out
+
+
+def make_bundle(
+    key: str = "bench",
+    *,
+    participants: int = 200,
+    memberships: int = 200,
+    sites: int = 100,
+    assets: int = 100,
+    meters: int = 400,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """
+    A bundle (as parsed YAML/JSON) with the requested collection sizes.
+    """
+    rng = random.Random(seed)
+    p_keys = [f"p{i:06d}" for i in range(participants)]
+    s_keys = [f"s{i:06d}" for i in range(sites)]
+
+    def owner() -> dict[str, str]:
+        return {"kind": "participant", "ref": rng.choice(p_keys)}
+
+    def site() -> str | None:
+        return rng.choice(s_keys) if s_keys and rng.random() < 0.9 else None
+
+    return {
+        "context": {
+            "base": f"https://registry.example.org/{key}/",
+            "prefixes": {"celine": "https://celine-eu.github.io/ontologies/celine#"},
+        },
+        "community": {
+            "key": key,
+            "name": f"Benchmark REC {key}",
+            "description": "Synthetic renewable energy community",
+            "region": "IT-TN",
+            "established": "2024-01-01",
+        },
+        "participants": [
+            {
+                "key": k,
+                "kind": rng.choice(_KINDS),
+                "name": f"Participant {i}",
+                "tariff": f"T{rng.randint(1, 4)}",
+                "contact": {
+                    "email": f"{k}@example.org",
+                    "phone": f"+39 0461 {rng.randint(100000, 999999)}",
+                },
+                "tags": rng.sample(_TAGS, rng.randint(0, 2)),
+            }
+            for i, k in enumerate(p_keys)
+        ],
+        "memberships": [
+            {
+                "key": f"mb{i:06d}",
+                "participant": p_keys[i % participants],
+                "role": rng.choice(_ROLES),
+                "status": "celine:Active" if rng.random() < 0.95 else "celine:Pending",
+                "valid_from": f"20{rng.randint(22, 25)}-0{rng.randint(1, 9)}-01",
+                "share": round(rng.uniform(0.1, 1.0), 3),
+            }
+            for i in range(memberships)
+        ],
+        "sites": [
+            {
+                "key": k,
+                "name": f"Site {i}",
+                "area": rng.choice(_AREAS),
+                "location": {
+                    "lat": round(rng.uniform(45.8, 46.3), 5),
+                    "lon": round(rng.uniform(10.8, 11.4), 5),
+                },
+            }
+            for i, k in enumerate(s_keys)
+        ],
+        "assets": [
+            {
+                "key": f"a{i:06d}",
+                "name": f"Asset {i}",
+                "owner": owner(),
+                "located_at": site(),
+                "category": rng.choice(_CATEGORIES),
+                "capacity_kw": round(rng.uniform(1.5, 200.0), 1),
+                "datasets": _datasets(rng, f"a{i:06d}", rng.randint(1, 2)),
+            }
+            for i in range(assets)
+        ],
+        "meters": [
+            {
+                "key": f"m{i:06d}",
+                "name": f"Meter {i}",
+                "owner": owner(),
+                "located_at": site(),
+                "sensor_id": None if i % PLACEHOLDER_EVERY == 0 else f"sens-{key}-{i}",
+                "pod": f"IT001E{rng.randint(0, 99999999):08d}",
+                "phase": rng.choice(["mono", "three"]),
+                "datasets": _datasets(rng, f"m{i:06d}", rng.randint(1, 3)),
+            }
+            for i in range(meters)
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entities", type=int, default=1000, help="Total entities")
+    parser.add_argument("--key", default="bench", help="Community key")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    bundle = make_bundle(args.key, seed=args.seed, **counts(args.entities))
+    sys.stdout.write(dump_yaml(bundle))
+
+
+if __name__ == "__main__":
+    main()
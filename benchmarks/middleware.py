@@ -0,0 +1,128 @@
+"""
+Middleware benchmark: BaseHTTPMiddleware vs pure ASGI PolicyMiddleware.
+
+Serves the registry routers behind no policy middleware, the previous
+``BaseHTTPMiddleware`` implementation and the current pure ASGI one, and
+measures per-request latency in-process (httpx ASGI transport, no network) on
+``/health`` and a community participants page. Prints JSON.
+
+Usage:
+    DATABASE_URL=... python -m benchmarks.middleware --community <key> [--requests 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+from celine.rec_registry.api.admin import router as admin_router
+from celine.rec_registry.api.communities import router as communities_router
+from celine.rec_registry.api.meta import router as meta_router
+from celine.rec_registry.core.middleware import PolicyMiddleware
+from celine.rec_registry.core.policy import AccessPolicy
+from celine.rec_registry.db.session import engine
+
+
+class LegacyPolicyMiddleware(BaseHTTPMiddleware):
+    """
+    The BaseHTTPMiddleware implementation PolicyMiddleware replaced.
+    """
+
+    def __init__(self, app, policy: AccessPolicy | None = None):
+        super().__init__(app)
+        self.policy = policy or AccessPolicy()
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        method = request.method.upper()
+        is_admin = path.startswith("/admin")
+        is_write = method in {"POST", "PUT", "PATCH", "DELETE"}
+
+        if is_admin:
+            d = await self.policy.allow_admin(request)
+            if not d.allowed:
+                return JSONResponse(
+                    {"detail": d.reason or "Admin access denied"}, status_code=403
+                )
+
+        if is_write and not is_admin:
+            d = await self.policy.allow_write(request)
+            if not d.allowed:
+                return JSONResponse(
+                    {"detail": d.reason or "Write access denied"}, status_code=403
+                )
+
+        return await call_next(request)
+
+
+VARIANTS = {
+    "none": None,
+    "base_http": LegacyPolicyMiddleware,
+    "pure_asgi": PolicyMiddleware,
+}
+
+
+def _app(middleware) -> FastAPI:
+    app = FastAPI()
+    if middleware is not None:
+        app.add_middleware(middleware)
+    app.include_router(meta_router)
+    app.include_router(admin_router)
+    app.include_router(communities_router)
+    return app
+
+
+async def _latencies(client: httpx.AsyncClient, path: str, n: int) -> dict[str, float]:
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        r = await client.get(path)
+        samples.append(time.perf_counter() - t0)
+        r.raise_for_status()
+    samples.sort()
+    return {
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p95_us": samples[int(len(samples) * 0.95)] * 1e6,
+    }
+
+
+async def run(community_key: str, requests: int) -> dict[str, object]:
+    paths = {
+        "health": "/health",
+        "participants": f"/communities/{community_key}/participants?limit=50",
+    }
+    results: dict[str, dict[str, object]] = {name: {} for name in paths}
+    for variant, middleware in VARIANTS.items():
+        transport = httpx.ASGITransport(app=_app(middleware))
+        async with httpx.AsyncClient(transport=transport, base_url="http://b") as c:
+            for name, path in paths.items():
+                await _latencies(c, path, max(requests // 10, 1))  # warm up
+                results[name][variant] = await _latencies(c, path, requests)
+    await engine.dispose()
+    return {
+        "benchmark": "middleware.policy",
+        "community": community_key,
+        "requests": requests,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--community", required=True, help="Community key to list")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per case")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.community, args.requests)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Read-path benchmark: ORM entity hydration vs column projection.
+
+Reads every meter of one community the way the list endpoint used to (full
+``select(Meter, Participant, Site)`` + hand-built dicts + ``jsonable_encoder`` +
+``json.dumps``) and the way it does now (projected columns + row mappings +
+``encode_json``), then prints rows/s for both as JSON.
+
+Usage:
+    DATABASE_URL=... python -m benchmarks.read_path --community <key> [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+
+from celine.rec_registry.api.util import encode_json
+from celine.rec_registry.db.models import Community, Meter, Participant, Site
+from celine.rec_registry.db.session import SessionLocal, engine
+from celine.rec_registry.services.queries import community_projection, to_items
+
+
+async def _orm(session, community_id) -> int:
+    q = (
+        select(Meter, Participant, Site)
+        .join(Participant, Meter.owner_participant_id == Participant.id)
+        .outerjoin(Site, Meter.site_id == Site.id)
+        .where(Meter.community_id == community_id)
+        .order_by(Meter.key)
+    )
+    rows = (await session.execute(q)).all()
+    items = [
+        {
+            "id": m.iri,
+            "key": m.key,
+            "iri": m.iri,
+            "owner": p.iri,
+            "site": s.iri if s else None,
+            "sensor_id": m.sensor_id,
+            "pod": m.pod,
+            "name": m.name,
+            "extra": m.extra,
+        }
+        for m, p, s in rows
+    ]
+    json.dumps(jsonable_encoder({"items": items, "next_cursor": None}))
+    return len(items)
+
+
+async def _projection(session, community_id) -> int:
+    q = community_projection("meters", community_id).order_by(Meter.key)
+    rows = (await session.execute(q)).mappings().all()
+    items = to_items(rows)
+    encode_json({"items": items, "next_cursor": None})
+    return len(items)
+
+
+async def _measure(fn, community_id, repeat: int) -> dict[str, float]:
+    total_rows = 0
+    elapsed = 0.0
+    for _ in range(repeat):
+        # Fresh session per run: the ORM path must not benefit from the identity map
+        async with SessionLocal() as session:
+            t0 = time.perf_counter()
+            total_rows += await fn(session, community_id)
+            elapsed += time.perf_counter() - t0
+    return {
+        "rows": total_rows // repeat,
+        "seconds": elapsed / repeat,
+        "rows_per_s": total_rows / elapsed if elapsed else 0.0,
+    }
+
+
+async def run(community_key: str, repeat: int) -> dict[str, object]:
+    async with SessionLocal() as session:
+        community_id = await session.scalar(
+            select(Community.id).where(Community.key == community_key)
+        )
+    if community_id is None:
+        raise SystemExit(f"Community not found: {community_key}")
+
+    # Warm up connections and statement caches for both paths
+    await _measure(_orm, community_id, 1)
+    await _measure(_projection, community_id, 1)
+
+    before = await _measure(_orm, community_id, repeat)
+    after = await _measure(_projection, community_id, repeat)
+    await engine.dispose()
+    return {
+        "benchmark": "read_path.meters",
+        "community": community_key,
+        "repeat": repeat,
+        "orm": before,
+        "projection": after,
+        "speedup": (
+            after["rows_per_s"] / before["rows_per_s"] if before["rows_per_s"] else None
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--community", required=True, help="Community key to read")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.community, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+End-to-end benchmark suite: import, export and list reads at several sizes.
+
+For each size a synthetic bundle (``benchmarks/bundles.py``) is imported as the
+community ``bench-<size>`` (first into an empty registry, then again as a
+replacement of itself), exported as YAML, and every list endpoint is read
+through the full application in-process (httpx ASGI transport, no network):
+first page latency, a complete keyset walk and an NDJSON stream. Results are
+one JSON document with run metadata (package version, git revision, database
+server) so runs of different versions can be compared.
+
+Usage:
+    DATABASE_URL=... python -m benchmarks.suite [--sizes 1000,10000,100000] \\
+        [--repeat 5] [--output results.json] [--keep]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any
+
+import httpx
+import sqlalchemy
+from sqlalchemy import delete
+
+from benchmarks.bundles import counts, make_bundle
+from celine.rec_registry.core.settings import settings
+from celine.rec_registry.db.models import Community
+from celine.rec_registry.db.session import SessionLocal, engine
+from celine.rec_registry.main import app
+from celine.rec_registry.schemas.bundle import RegistryBundleIn
+from celine.rec_registry.services.community_cache import community_changed
+from celine.rec_registry.services.exporter import export_community_bundle_yaml
+from celine.rec_registry.services.importer import replacement_import_bundle
+
+LISTS = ["participants", "memberships", "sites", "assets", "meters"]
+
+# Largest page the list endpoints accept
+PAGE_SIZE = 500
+
+
+def _rate(rows: int, seconds: float) -> float:
+    return rows / seconds if seconds else 0.0
+
+
+def _latency(samples: list[float]) -> dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": samples[len(samples) // 2] * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95)] * 1000,
+    }
+
+
+async def _import(bundle: RegistryBundleIn) -> dict[str, Any]:
+    async with SessionLocal() as session:
+        t0 = time.perf_counter()
+        async with session.begin():
+            _, deleted, inserted, warnings, _ = await replacement_import_bundle(
+                session=session, bundle=bundle, base_url=settings.base_url
+            )
+        elapsed = time.perf_counter() - t0
+    rows = sum(inserted.values())
+    return {
+        "seconds": elapsed,
+        "rows": rows,
+        "rows_per_s": _rate(rows, elapsed),
+        "deleted": sum(deleted.values()),
+        "warnings": len(warnings),
+    }
+
+
+async def _export(key: str, repeat: int) -> dict[str, Any]:
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        async with SessionLocal() as session:
+            t0 = time.perf_counter()
+            text = await export_community_bundle_yaml(session, community_key=key)
+            samples.append(time.perf_counter() - t0)
+        size = len(text.encode("utf-8"))
+    return {"bytes": size, "seconds": min(samples), **_latency(samples)}
+
+
+async def _walk(client: httpx.AsyncClient, path: str) -> dict[str, Any]:
+    rows = pages = 0
+    cursor = None
+    t0 = time.perf_counter()
+    while True:
+        params: dict[str, Any] = {"limit": PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        r = await client.get(path, params=params)
+        r.raise_for_status()
+        body = r.json()
+        rows += len(body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    elapsed = time.perf_counter() - t0
+    return {
+        "rows": rows,
+        "pages": pages,
+        "seconds": elapsed,
+        "rows_per_s": _rate(rows, elapsed),
+    }
+
+
+async def _ndjson(client: httpx.AsyncClient, path: str) -> dict[str, Any]:
+    rows = size = 0
+    t0 = time.perf_counter()
+    async with client.stream("GET", path, params={"format": "ndjson"}) as r:
+        r.raise_for_status()
+        async for line in r.aiter_lines():
+            if line:
+                rows += 1
+                size += len(line) + 1
+    elapsed = time.perf_counter() - t0
+    return {
+        "rows": rows,
+        "bytes": size,
+        "seconds": elapsed,
+        "rows_per_s": _rate(rows, elapsed),
+    }
+
+
+async def _lists(
+    client: httpx.AsyncClient, key: str, repeat: int
+) -> dict[str, dict[str, Any]]:
+    results = {}
+    for entity in LISTS:
+        path = f"/communities/{key}/{entity}"
+        first_page = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            r = await client.get(path, params={"limit": PAGE_SIZE})
+            first_page.append(time.perf_counter() - t0)
+            r.raise_for_status()
+        results[entity] = {
+            "first_page": _latency(first_page),
+            "walk": await _walk(client, path),
+            "ndjson": await _ndjson(client, path),
+        }
+    return results
+
+
+async def _drop(key: str) -> None:
+    async with SessionLocal() as session, session.begin():
+        await session.execute(delete(Community).where(Community.key == key))
+        await community_changed(session, key)
+
+
+async def _size(client: httpx.AsyncClient, entities: int, repeat: int, keep: bool):
+    key = f"bench-{entities}"
+    sizes = counts(entities)
+    t0 = time.perf_counter()
+    bundle = RegistryBundleIn.model_validate(make_bundle(key, **sizes))
+    validate = time.perf_counter() - t0
+
+    await _drop(key)
+    result = {
+        "community": key,
+        "entities": sizes,
+        "validate_seconds": validate,
+        "import": await _import(bundle),
+        "reimport": await _import(bundle),
+        "export_yaml": await _export(key, repeat),
+        "lists": await _lists(client, key, repeat),
+    }
+    if not keep:
+        await _drop(key)
+    return result
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _version() -> str | None:
+    try:
+        return metadata.version("celine-rec-registry")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+async def run(sizes: list[int], repeat: int, keep: bool) -> dict[str, Any]:
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            for entities in sizes:
+                results.append(await _size(client, entities, repeat, keep))
+    server = engine.dialect.server_version_info
+    await engine.dispose()
+    return {
+        "benchmark": "suite",
+        "started_at": started_at,
+        "version": _version(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "database": {
+            "dialect": engine.dialect.name,
+            "server_version": ".".join(map(str, server)) if server else None,
+        },
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000",
+        help="Comma-separated entity totals, one community each",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per latency case")
+    parser.add_argument("--output", help="Write the JSON here instead of stdout")
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the bench-* communities afterwards"
+    )
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    text = json.dumps(asyncio.run(run(sizes, args.repeat, args.keep)), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,39 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Body, Query, HTTPException
+import time
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    UploadFile,
+    File,
+    Body,
+    Query,
+    HTTPException,
+    Request,
+)
 from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from celine.rec_registry.db.session import get_session
+from celine.rec_registry.core.metrics import observe_import
+from celine.rec_registry.db.pool import pool_status
+from celine.rec_registry.db.session import ENGINES, get_session
 from celine.rec_registry.core.yaml_io import load_yaml
 from celine.rec_registry.schemas.bundle import RegistryBundleIn
-from celine.rec_registry.services.importer import replacement_import_bundle
+from celine.rec_registry.services.importer import (
+    incremental_import_bundle,
+    replacement_import_bundle,
+)
 from celine.rec_registry.services.exporter import export_community_bundle_yaml
 from celine.rec_registry.schemas.admin import ImportReport, ImportRequest
 from celine.rec_registry.core.settings import settings
+from celine.rec_registry.services.community_cache import resolve_community
+from celine.rec_registry.api.streaming import batches_response, community_batches
+from celine.rec_registry.api.util import (
+    cached_response,
+    export_format_param,
+    ExportFormat,
+    store_response,
+)
+from celine.rec_registry.services.response_cache import response_cache
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -19,34 +44,108 @@ async def admin_import(
     session: AsyncSession = Depends(get_session),
 ):
     """
-    Replacement import of a REC YAML bundle.
+    Import a REC YAML bundle.
 
-    - Deletes existing community graph (by community.key)
-    - Recreates it atomically
+    - ``replace`` (default): deletes the existing community graph (by
+      community.key) and recreates it atomically
+    - ``incremental``: diffs the bundle against the stored rows by key and
+      updates, inserts and deletes only what changed
     """
+    t0 = time.perf_counter()
+    updated: dict[str, int] = {}
+    unchanged: dict[str, int] = {}
     async with session.begin():
-        community_key, deleted, inserted, warnings = await replacement_import_bundle(
-            session=session,
-            bundle=payload.bundle,
-            base_url=settings.base_url,
-            dry_run=payload.dry_run,
-        )
+        if payload.mode == "incremental":
+            (
+                community_key,
+                deleted,
+                inserted,
+                updated,
+                unchanged,
+                warnings,
+                revision,
+            ) = await incremental_import_bundle(
+                session=session,
+                bundle=payload.bundle,
+                base_url=settings.base_url,
+                dry_run=payload.dry_run,
+            )
+        else:
+            (
+                community_key,
+                deleted,
+                inserted,
+                warnings,
+                revision,
+            ) = await replacement_import_bundle(
+                session=session,
+                bundle=payload.bundle,
+                base_url=settings.base_url,
+                dry_run=payload.dry_run,
+            )
+    observe_import(
+        time.perf_counter() - t0,
+        deleted,
+        inserted,
+        payload.dry_run,
+        payload.mode,
+        updated,
+    )
 
     return ImportReport(
         community_key=community_key,
+        revision=revision,
         deleted=deleted,
         inserted=inserted,
+        updated=updated,
+        unchanged=unchanged,
         warnings=warnings,
     )
 
 
 @router.get("/export", response_class=PlainTextResponse)
 async def admin_export(
+    request: Request,
     community: str = Query(..., description="Community key"),
     session: AsyncSession = Depends(get_session),
+    fmt: ExportFormat = Depends(export_format_param),
 ):
+    """
+    Export a community as a YAML bundle, or stream it as RDF (``ttl``, ``nt``,
+    ``jsonld-expanded``).
+    """
+    ref = await resolve_community(session, community)
+    if ref is None:
+        raise HTTPException(status_code=404, detail=f"Community not found: {community}")
+    if fmt != "yaml":
+        cached = cached_response(request, ref, ("export", fmt), fmt)
+        if cached:
+            return cached
+        return batches_response(ref, fmt, community_batches(ref))
+    cache_key = ("export",)
+    cached = cached_response(request, ref, cache_key)
+    if cached:
+        return cached
     try:
         text = await export_community_bundle_yaml(session, community_key=community)
     except KeyError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    return text
+    return store_response(
+        ref, cache_key, text.encode("utf-8"), "text/plain; charset=utf-8"
+    )
+
+
+@router.get("/cache")
+async def admin_cache_stats():
+    """
+    Response cache counters, for sizing RESPONSE_CACHE_BYTES.
+    """
+    return response_cache.stats()
+
+
+@router.get("/pool")
+async def admin_pool_stats():
+    """
+    Connection pool usage and checkout wait per database, for sizing DB_POOL_*.
+    """
+    return {db: pool_status(e.sync_engine.pool) for db, e in ENGINES.items()}
@@ -1,8 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from celine.rec_registry.db.session import get_session
+from celine.rec_registry.db.session import sessionmaker_for
 from celine.rec_registry.db.models import (
     Community,
     Participant,
@@ -11,271 +10,341 @@ from celine.rec_registry.db.models import (
     Asset,
     Meter,
 )
-from celine.rec_registry.api.util import format_param, maybe_jsonld, Format
+from celine.rec_registry.services.queries import (
+    community_projection,
+    projection,
+    to_items,
+    where_extra,
+)
+from celine.rec_registry.api.util import (
+    cached_response,
+    community_ref,
+    encode_json,
+    extra_filters_param,
+    ExtraFilters,
+    fields_param,
+    format_param,
+    graph_format_param,
+    GraphFormat,
+    json_response,
+    maybe_jsonld,
+    Fields,
+    Format,
+    JSON_MEDIA_TYPE,
+    list_format_param,
+    ListFormat,
+    rdf_fields,
+    read_session,
+    STREAMED_VARIANTS,
+)
+from celine.rec_registry.api.streaming import (
+    batches_response,
+    community_batches,
+    streamed_response,
+)
+from celine.rec_registry.services.graph import community_graph
+from celine.rec_registry.services.stats import community_stats
+from celine.rec_registry.services.community_cache import CommunityRef
+from celine.rec_registry.api.pagination import (
+    cursor_scope,
+    keyset,
+    page as keyset_page,
+)
 
 router = APIRouter(tags=["registry"])
 
 
-def _cursor_slice(items, limit: int, cursor: str | None):
-    # Simple cursor: cursor is last key returned
-    if cursor:
-        items = [x for x in items if x["key"] > cursor]
-    items = sorted(items, key=lambda x: x["key"])
-    page = items[:limit]
-    next_cursor = page[-1]["key"] if len(page) == limit else None
-    return page, next_cursor
-
-
 @router.get("/communities")
 async def list_communities(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(read_session),
     fmt: Format = Depends(format_param),
+    selected: Fields = Depends(fields_param("communities")),
+    extra: ExtraFilters = Depends(extra_filters_param),
     key: str | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=500),
     cursor: str | None = Query(default=None),
 ):
-    q = select(Community)
+    q = projection("communities", selected)
+    q = where_extra(q, "communities", extra)
+    scope = cursor_scope("communities", extra, key)
     if key:
         q = q.where(Community.key == key)
-    rows = (await session.scalars(q)).all()
+    q = keyset(q, Community.key, limit=limit, cursor=cursor, scope=scope)
+    rows = (await session.execute(q)).mappings().all()
 
-    items = [
-        {
-            "id": c.iri,
-            "key": c.key,
-            "iri": c.iri,
-            "name": c.name,
-            "description": c.description,
-            "extra": c.extra,
-        }
-        for c in rows
-    ]
-    page, next_cursor = _cursor_slice(items, limit, cursor)
+    page, next_cursor = keyset_page(to_items(rows, selected), limit, scope=scope)
     payload = {"items": page, "next_cursor": next_cursor}
-    return maybe_jsonld(fmt, payload)
+    return Response(
+        content=encode_json(maybe_jsonld(fmt, payload)), media_type=JSON_MEDIA_TYPE
+    )
 
 
 @router.get("/communities/{community_key}")
 async def get_community(
-    community_key: str,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    ref: CommunityRef = Depends(community_ref),
+    session: AsyncSession = Depends(read_session),
     fmt: Format = Depends(format_param),
+    selected: Fields = Depends(fields_param("communities")),
+):
+    cache_key = ("community", selected, fmt)
+    cached = cached_response(request, ref, cache_key, fmt)
+    if cached:
+        return cached
+    q = projection("communities", selected).where(Community.id == ref.id)
+    rows = (await session.execute(q)).mappings().all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Community not found")
+    payload = to_items(rows, selected)[0]
+    return json_response(ref, cache_key, fmt, payload)
+
+
+@router.get("/communities/{community_key}/graph")
+async def get_community_graph(
+    request: Request,
+    c: CommunityRef = Depends(community_ref),
+    session: AsyncSession = Depends(read_session),
+    fmt: GraphFormat = Depends(graph_format_param),
+    include_extra: bool = Query(default=True, description="Include extra objects"),
 ):
-    c = await session.scalar(select(Community).where(Community.key == community_key))
-    if c is None:
+    """
+    Community with all participants, memberships, sites, assets and meters.
+
+    References (membership participant, asset/meter owner and site) are integer
+    indexes into the participants / sites arrays. RDF formats stream every entity
+    as a node (references are IRIs) and always include extra.
+    """
+    cache_key = ("graph", include_extra, fmt)
+    cached = cached_response(request, c, cache_key, fmt)
+    if cached:
+        return cached
+    if fmt in STREAMED_VARIANTS:
+        return batches_response(c, fmt, community_batches(c, sessionmaker_for(session)))
+    snapshot = await community_graph(
+        c.key, include_extra=include_extra, sessionmaker=sessionmaker_for(session)
+    )
+    if snapshot is None:
         raise HTTPException(status_code=404, detail="Community not found")
+    ref, payload = snapshot
+    return json_response(ref, cache_key, fmt, payload)
+
+
+@router.get("/communities/{community_key}/stats")
+async def get_community_stats(
+    request: Request,
+    c: CommunityRef = Depends(community_ref),
+    session: AsyncSession = Depends(read_session),
+    fmt: Format = Depends(format_param),
+):
+    """
+    Entity totals and grouped counts (participants by kind, memberships by status,
+    assets by category, meters per site) for dashboards.
+    """
+    cache_key = ("stats", fmt)
+    cached = cached_response(request, c, cache_key, fmt)
+    if cached:
+        return cached
     payload = {
-        "id": c.iri,
-        "key": c.key,
-        "iri": c.iri,
-        "name": c.name,
-        "description": c.description,
-        "extra": c.extra,
+        "community": c.iri,
+        "revision": c.revision,
+        **(await community_stats(session, c.id)),
     }
-    return maybe_jsonld(fmt, payload)
+    return json_response(c, cache_key, fmt, payload)
 
 
 @router.get("/communities/{community_key}/participants")
 async def list_participants(
-    community_key: str,
-    session: AsyncSession = Depends(get_session),
-    fmt: Format = Depends(format_param),
+    request: Request,
+    c: CommunityRef = Depends(community_ref),
+    session: AsyncSession = Depends(read_session),
+    fmt: ListFormat = Depends(list_format_param),
+    selected: Fields = Depends(fields_param("participants")),
+    extra: ExtraFilters = Depends(extra_filters_param),
     kind: str | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=500),
     cursor: str | None = Query(default=None),
 ):
-    c = await session.scalar(select(Community).where(Community.key == community_key))
-    if c is None:
-        raise HTTPException(status_code=404, detail="Community not found")
-    q = select(Participant).where(Participant.community_id == c.id)
+    cache_key = ("participants", extra, kind, cursor, limit, selected, fmt)
+    cached = cached_response(request, c, cache_key, fmt)
+    if cached:
+        return cached
+    selected = rdf_fields(fmt, selected)
+    q = community_projection("participants", c.id, selected)
+    q = where_extra(q, "participants", extra)
+    scope = cursor_scope("participants", c.id, extra, kind)
     if kind:
         q = q.where(Participant.kind == kind)
-    rows = (await session.scalars(q)).all()
-    items = [
-        {
-            "id": p.iri,
-            "key": p.key,
-            "iri": p.iri,
-            "kind": p.kind,
-            "name": p.name,
-            "auth_iri": p.auth_iri,
-            "extra": p.extra,
-        }
-        for p in rows
-    ]
-    page, next_cursor = _cursor_slice(items, limit, cursor)
-    return maybe_jsonld(fmt, {"items": page, "next_cursor": next_cursor})
+    if fmt in STREAMED_VARIANTS:
+        q = keyset(q, Participant.key, limit=None, cursor=cursor, scope=scope)
+        return streamed_response(session, c, fmt, "participants", q, selected)
+    q = keyset(q, Participant.key, limit=limit, cursor=cursor, scope=scope)
+    rows = (await session.execute(q)).mappings().all()
+    page, next_cursor = keyset_page(to_items(rows, selected), limit, scope=scope)
+    return json_response(c, cache_key, fmt, {"items": page, "next_cursor": next_cursor})
 
 
 @router.get("/communities/{community_key}/memberships")
 async def list_memberships(
-    community_key: str,
-    session: AsyncSession = Depends(get_session),
-    fmt: Format = Depends(format_param),
+    request: Request,
+    c: CommunityRef = Depends(community_ref),
+    session: AsyncSession = Depends(read_session),
+    fmt: ListFormat = Depends(list_format_param),
+    selected: Fields = Depends(fields_param("memberships")),
+    extra: ExtraFilters = Depends(extra_filters_param),
     participant: str | None = Query(default=None, description="participant key"),
     role_iri: str | None = Query(default=None),
     status_iri: str | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=500),
     cursor: str | None = Query(default=None),
 ):
-    c = await session.scalar(select(Community).where(Community.key == community_key))
-    if c is None:
-        raise HTTPException(status_code=404, detail="Community not found")
-
-    q = (
-        select(Membership, Participant)
-        .join(Participant, Membership.participant_id == Participant.id)
-        .where(Membership.community_id == c.id)
+    cache_key = (
+        "memberships",
+        extra,
+        participant,
+        role_iri,
+        status_iri,
+        cursor,
+        limit,
+        selected,
+        fmt,
     )
+    cached = cached_response(request, c, cache_key, fmt)
+    if cached:
+        return cached
+    selected = rdf_fields(fmt, selected)
+    q = community_projection("memberships", c.id, selected)
+    q = where_extra(q, "memberships", extra)
+    scope = cursor_scope("memberships", c.id, extra, participant, role_iri, status_iri)
     if participant:
         q = q.where(Participant.key == participant)
     if role_iri:
         q = q.where(Membership.role_iri == role_iri)
     if status_iri:
         q = q.where(Membership.status_iri == status_iri)
-
-    rows = (await session.execute(q)).all()
-    items = []
-    for m, p in rows:
-        items.append(
-            {
-                "id": m.iri,
-                "key": m.key,
-                "iri": m.iri,
-                "community": c.iri,
-                "participant": p.iri,
-                "role_iri": m.role_iri,
-                "status_iri": m.status_iri,
-                "valid_from": m.valid_from,
-                "valid_to": m.valid_to,
-                "extra": m.extra,
-            }
+    if fmt in STREAMED_VARIANTS:
+        q = keyset(q, Membership.key, limit=None, cursor=cursor, scope=scope)
+        return streamed_response(
+            session, c, fmt, "memberships", q, selected, community=c.iri
         )
-    page, next_cursor = _cursor_slice(items, limit, cursor)
-    return maybe_jsonld(fmt, {"items": page, "next_cursor": next_cursor})
+    q = keyset(q, Membership.key, limit=limit, cursor=cursor, scope=scope)
+
+    rows = (await session.execute(q)).mappings().all()
+    items = to_items(rows, selected, community=c.iri)
+    page, next_cursor = keyset_page(items, limit, scope=scope)
+    return json_response(c, cache_key, fmt, {"items": page, "next_cursor": next_cursor})
 
 
 @router.get("/communities/{community_key}/sites")
 async def list_sites(
-    community_key: str,
-    session: AsyncSession = Depends(get_session),
-    fmt: Format = Depends(format_param),
+    request: Request,
+    c: CommunityRef = Depends(community_ref),
+    session: AsyncSession = Depends(read_session),
+    fmt: ListFormat = Depends(list_format_param),
+    selected: Fields = Depends(fields_param("sites")),
+    extra: ExtraFilters = Depends(extra_filters_param),
     area: str | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=500),
     cursor: str | None = Query(default=None),
 ):
-    c = await session.scalar(select(Community).where(Community.key == community_key))
-    if c is None:
-        raise HTTPException(status_code=404, detail="Community not found")
-    q = select(Site).where(Site.community_id == c.id)
+    cache_key = ("sites", extra, area, cursor, limit, selected, fmt)
+    cached = cached_response(request, c, cache_key, fmt)
+    if cached:
+        return cached
+    selected = rdf_fields(fmt, selected)
+    q = community_projection("sites", c.id, selected)
+    q = where_extra(q, "sites", extra)
+    scope = cursor_scope("sites", c.id, extra, area)
     if area:
         q = q.where(Site.area == area)
-    rows = (await session.scalars(q)).all()
-    items = [
-        {
-            "id": s.iri,
-            "key": s.key,
-            "iri": s.iri,
-            "name": s.name,
-            "area": s.area,
-            "extra": s.extra,
-        }
-        for s in rows
-    ]
-    page, next_cursor = _cursor_slice(items, limit, cursor)
-    return maybe_jsonld(fmt, {"items": page, "next_cursor": next_cursor})
+    if fmt in STREAMED_VARIANTS:
+        q = keyset(q, Site.key, limit=None, cursor=cursor, scope=scope)
+        return streamed_response(session, c, fmt, "sites", q, selected)
+    q = keyset(q, Site.key, limit=limit, cursor=cursor, scope=scope)
+    rows = (await session.execute(q)).mappings().all()
+    page, next_cursor = keyset_page(to_items(rows, selected), limit, scope=scope)
+    return json_response(c, cache_key, fmt, {"items": page, "next_cursor": next_cursor})
 
 
 @router.get("/communities/{community_key}/assets")
 async def list_assets(
-    community_key: str,
-    session: AsyncSession = Depends(get_session),
-    fmt: Format = Depends(format_param),
+    request: Request,
+    c: CommunityRef = Depends(community_ref),
+    session: AsyncSession = Depends(read_session),
+    fmt: ListFormat = Depends(list_format_param),
+    selected: Fields = Depends(fields_param("assets")),
+    extra: ExtraFilters = Depends(extra_filters_param),
     owner: str | None = Query(default=None, description="owner participant key"),
     category_iri: str | None = Query(default=None),
     site: str | None = Query(default=None, description="site key"),
     limit: int = Query(default=50, ge=1, le=500),
     cursor: str | None = Query(default=None),
 ):
-    c = await session.scalar(select(Community).where(Community.key == community_key))
-    if c is None:
-        raise HTTPException(status_code=404, detail="Community not found")
-
-    q = (
-        select(Asset, Participant, Site)
-        .join(Participant, Asset.owner_participant_id == Participant.id)
-        .outerjoin(Site, Asset.site_id == Site.id)
-        .where(Asset.community_id == c.id)
+    cache_key = (
+        "assets",
+        extra,
+        owner,
+        category_iri,
+        site,
+        cursor,
+        limit,
+        selected,
+        fmt,
     )
+    cached = cached_response(request, c, cache_key, fmt)
+    if cached:
+        return cached
+    selected = rdf_fields(fmt, selected)
+    q = community_projection("assets", c.id, selected)
+    q = where_extra(q, "assets", extra)
+    scope = cursor_scope("assets", c.id, extra, owner, category_iri, site)
     if owner:
         q = q.where(Participant.key == owner)
     if category_iri:
         q = q.where(Asset.category_iri == category_iri)
     if site:
         q = q.where(Site.key == site)
-
-    rows = (await session.execute(q)).all()
-    items = []
-    for a, p, s in rows:
-        items.append(
-            {
-                "id": a.iri,
-                "key": a.key,
-                "iri": a.iri,
-                "owner": p.iri,
-                "site": s.iri if s else None,
-                "category_iri": a.category_iri,
-                "name": a.name,
-                "extra": a.extra,
-            }
-        )
-    page, next_cursor = _cursor_slice(items, limit, cursor)
-    return maybe_jsonld(fmt, {"items": page, "next_cursor": next_cursor})
+    if fmt in STREAMED_VARIANTS:
+        q = keyset(q, Asset.key, limit=None, cursor=cursor, scope=scope)
+        return streamed_response(session, c, fmt, "assets", q, selected)
+    q = keyset(q, Asset.key, limit=limit, cursor=cursor, scope=scope)
+    rows = (await session.execute(q)).mappings().all()
+    page, next_cursor = keyset_page(to_items(rows, selected), limit, scope=scope)
+    return json_response(c, cache_key, fmt, {"items": page, "next_cursor": next_cursor})
 
 
 @router.get("/communities/{community_key}/meters")
 async def list_meters(
-    community_key: str,
-    session: AsyncSession = Depends(get_session),
-    fmt: Format = Depends(format_param),
+    request: Request,
+    c: CommunityRef = Depends(community_ref),
+    session: AsyncSession = Depends(read_session),
+    fmt: ListFormat = Depends(list_format_param),
+    selected: Fields = Depends(fields_param("meters")),
+    extra: ExtraFilters = Depends(extra_filters_param),
     owner: str | None = Query(default=None, description="owner participant key"),
     site: str | None = Query(default=None, description="site key"),
     sensor_id: str | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=500),
     cursor: str | None = Query(default=None),
 ):
-    c = await session.scalar(select(Community).where(Community.key == community_key))
-    if c is None:
-        raise HTTPException(status_code=404, detail="Community not found")
-
-    q = (
-        select(Meter, Participant, Site)
-        .join(Participant, Meter.owner_participant_id == Participant.id)
-        .outerjoin(Site, Meter.site_id == Site.id)
-        .where(Meter.community_id == c.id)
-    )
+    cache_key = ("meters", extra, owner, site, sensor_id, cursor, limit, selected, fmt)
+    cached = cached_response(request, c, cache_key, fmt)
+    if cached:
+        return cached
+    selected = rdf_fields(fmt, selected)
+    q = community_projection("meters", c.id, selected)
+    q = where_extra(q, "meters", extra)
+    scope = cursor_scope("meters", c.id, extra, owner, site, sensor_id)
     if owner:
         q = q.where(Participant.key == owner)
     if site:
         q = q.where(Site.key == site)
     if sensor_id:
         q = q.where(Meter.sensor_id == sensor_id)
+    if fmt in STREAMED_VARIANTS:
+        q = keyset(q, Meter.key, limit=None, cursor=cursor, scope=scope)
+        return streamed_response(session, c, fmt, "meters", q, selected)
+    q = keyset(q, Meter.key, limit=limit, cursor=cursor, scope=scope)
 
-    rows = (await session.execute(q)).all()
-    items = []
-    for m, p, s in rows:
-        items.append(
-            {
-                "id": m.iri,
-                "key": m.key,
-                "iri": m.iri,
-                "owner": p.iri,
-                "site": s.iri if s else None,
-                "sensor_id": m.sensor_id,
-                "pod": m.pod,
-                "name": m.name,
-                "extra": m.extra,
-            }
-        )
-    page, next_cursor = _cursor_slice(items, limit, cursor)
-    return maybe_jsonld(fmt, {"items": page, "next_cursor": next_cursor})
+    rows = (await session.execute(q)).mappings().all()
+    page, next_cursor = keyset_page(to_items(rows, selected), limit, scope=scope)
+    return json_response(c, cache_key, fmt, {"items": page, "next_cursor": next_cursor})
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from pathlib import Path
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Response
 
+from celine.rec_registry.core.metrics import CONTENT_TYPE, REGISTRY
 from celine.rec_registry.core.settings import settings
 
 router = APIRouter(tags=["meta"])
@@ -11,3 +12,13 @@ router = APIRouter(tags=["meta"])
 @router.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus scrape endpoint (text exposition format).
+    """
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
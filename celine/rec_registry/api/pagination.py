@@ -0,0 +1,111 @@
+"""
+Keyset pagination for list endpoints.
+
+Pages are selected in SQL with ``WHERE key > :cursor ORDER BY key LIMIT :limit + 1``
+so they are served from the ``(community_id, key)`` unique indexes regardless of
+collection size. Cursors are opaque: the last key of a page is signed with an HMAC
+bound to the listing (collection, community and filters, see :func:`cursor_scope`),
+so clients cannot forge them or reuse them on another listing.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import Select
+from sqlalchemy.orm import InstrumentedAttribute
+
+from celine.rec_registry.core.settings import settings
+
+_SIG_BYTES = 16
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(scope: str, body: bytes) -> bytes:
+    mac = hmac.new(settings.cursor_secret.encode("utf-8"), digestmod=hashlib.sha256)
+    mac.update(scope.encode("utf-8"))
+    mac.update(b"\x00")
+    mac.update(body)
+    return mac.digest()[:_SIG_BYTES]
+
+
+def cursor_scope(collection: str, *parts: Any) -> str:
+    """
+    Signing scope of one listing: the collection plus whatever selects its rows
+    (community id, filter values). Formats and fieldsets are left out, they do
+    not change the row sequence.
+    """
+    return json.dumps([collection, *parts], separators=(",", ":"), default=str)
+
+
+def encode_cursor(value: Any, *, scope: str) -> str:
+    """
+    Encode a JSON-serializable position as an opaque cursor for ``scope``.
+    """
+    body = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    return f"{_b64encode(body)}.{_b64encode(_sign(scope, body))}"
+
+
+def decode_cursor(cursor: str, *, scope: str) -> Any:
+    """
+    Decode a cursor produced by :func:`encode_cursor` for the same ``scope``.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or its signature does not match.
+    """
+    try:
+        body_s, sig_s = cursor.split(".", 1)
+        body = _b64decode(body_s)
+        sig = _b64decode(sig_s)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not hmac.compare_digest(sig, _sign(scope, body)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset(
+    q: Select,
+    key_col: InstrumentedAttribute,
+    *,
+    limit: int | None,
+    cursor: str | None,
+    scope: str,
+) -> Select:
+    """
+    Restrict ``q`` to the page after ``cursor``, ordered by ``key_col``.
+
+    One extra row is fetched so :func:`page` can tell whether a next page exists.
+    With ``limit=None`` every row after the cursor is selected (streaming reads).
+    """
+    if cursor:
+        q = q.where(key_col > decode_cursor(cursor, scope=scope))
+    q = q.order_by(key_col)
+    return q if limit is None else q.limit(limit + 1)
+
+
+def page(
+    items: list[dict[str, Any]], limit: int, *, scope: str
+) -> tuple[list[dict[str, Any]], str | None]:
+    """
+    Trim the look-ahead row of a :func:`keyset` query and build the next cursor.
+    """
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, encode_cursor(items[-1]["key"], scope=scope)
@@ -0,0 +1,197 @@
+"""
+RDF serializations (N-Triples, Turtle, expanded JSON-LD) of registry items.
+
+Terms come from the bundled CELINE context (``resources/celine.jsonld``), so no
+network fetch is needed. Writers turn batches of response items into bytes as
+they arrive; nothing is accumulated into an in-memory graph.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from importlib import resources
+from typing import Any, Iterable
+
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+RDF_JSON = "http://www.w3.org/1999/02/22-rdf-syntax-ns#JSON"
+
+CONTEXT: dict[str, Any] = json.loads(
+    resources.files("celine.rec_registry.resources")
+    .joinpath("celine.jsonld")
+    .read_text(encoding="utf-8")
+)["@context"]
+
+PREFIXES: dict[str, str] = {
+    name: value
+    for name, value in CONTEXT.items()
+    if isinstance(value, str) and value.endswith(("#", "/"))
+}
+
+# Entity (plural) -> class term in the context
+CLASS_TERMS = {
+    "communities": "EnergyCommunity",
+    "participants": "Participant",
+    "memberships": "Membership",
+    "sites": "Site",
+    "assets": "Asset",
+    "meters": "Meter",
+}
+
+_PN_LOCAL = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]*$")
+_IRI_UNSAFE = re.compile(r'[\x00-\x20<>"{}|^`\\]')
+_LITERAL_ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_LITERAL_UNSAFE = re.compile(r'[\\"\n\r\t]')
+
+
+def _expand(curie: str) -> str:
+    prefix, _, local = curie.partition(":")
+    return PREFIXES[prefix] + local if prefix in PREFIXES else curie
+
+
+@dataclass(frozen=True)
+class Term:
+    iri: str
+    curie: str | None
+    # "literal", "iri" (object is a node reference) or "json" (rdf:JSON literal)
+    kind: str
+
+
+def _terms() -> dict[str, Term]:
+    terms = {}
+    for name, definition in CONTEXT.items():
+        if name.startswith("@") or name in PREFIXES or name in CLASS_TERMS.values():
+            continue
+        if isinstance(definition, str):
+            ref, type_ = definition, None
+        else:
+            ref, type_ = definition["@id"], definition.get("@type")
+        if ref.startswith("@"):
+            continue
+        kind = {"@id": "iri", "@json": "json"}.get(type_, "literal")
+        prefix, _, local = ref.partition(":")
+        curie = ref if prefix in PREFIXES and _PN_LOCAL.match(local) else None
+        terms[name] = Term(_expand(ref), curie, kind)
+    return terms
+
+
+# Response field -> RDF term; fields without a term (e.g. "iri") are not emitted
+TERMS = _terms()
+CLASSES = {entity: _expand(CONTEXT[term]) for entity, term in CLASS_TERMS.items()}
+CLASS_CURIES = {entity: CONTEXT[term] for entity, term in CLASS_TERMS.items()}
+
+
+def _iri(value: str) -> str:
+    return "<" + _IRI_UNSAFE.sub(lambda m: f"%{ord(m.group()):02X}", value) + ">"
+
+
+def _literal(value: str) -> str:
+    return '"' + _LITERAL_UNSAFE.sub(lambda m: _LITERAL_ESCAPES[m.group()], value) + '"'
+
+
+def _fields(item: dict[str, Any]) -> Iterable[tuple[Term, Any]]:
+    for name, value in item.items():
+        term = TERMS.get(name)
+        if term is None or value is None:
+            continue
+        if term.kind == "json" and not value:
+            continue
+        yield term, value
+
+
+def _json_text(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+class NTriplesWriter:
+    media_type = "application/n-triples"
+
+    def start(self) -> bytes:
+        return b""
+
+    def write(self, entity: str, items: list[dict[str, Any]]) -> bytes:
+        lines = []
+        for item in items:
+            s = _iri(item["id"])
+            lines.append(f"{s} <{RDF_TYPE}> <{CLASSES[entity]}> .\n")
+            for term, value in _fields(item):
+                if term.kind == "iri":
+                    o = _iri(value)
+                elif term.kind == "json":
+                    o = f"{_literal(_json_text(value))}^^<{RDF_JSON}>"
+                else:
+                    o = _literal(str(value))
+                lines.append(f"{s} <{term.iri}> {o} .\n")
+        return "".join(lines).encode("utf-8")
+
+    def end(self) -> bytes:
+        return b""
+
+
+class TurtleWriter:
+    media_type = "text/turtle"
+
+    def start(self) -> bytes:
+        return "".join(
+            f"@prefix {name}: <{iri}> .\n" for name, iri in PREFIXES.items()
+        ).encode("utf-8")
+
+    def write(self, entity: str, items: list[dict[str, Any]]) -> bytes:
+        blocks = []
+        for item in items:
+            parts = [f"\n{_iri(item['id'])} a {CLASS_CURIES[entity]}"]
+            for term, value in _fields(item):
+                p = term.curie or _iri(term.iri)
+                if term.kind == "iri":
+                    o = _iri(value)
+                elif term.kind == "json":
+                    o = f"{_literal(_json_text(value))}^^rdf:JSON"
+                else:
+                    o = _literal(str(value))
+                parts.append(f"    {p} {o}")
+            blocks.append(" ;\n".join(parts) + " .\n")
+        return "".join(blocks).encode("utf-8")
+
+    def end(self) -> bytes:
+        return b""
+
+
+class ExpandedJsonLdWriter:
+    media_type = "application/ld+json"
+
+    def __init__(self) -> None:
+        self._first = True
+
+    def start(self) -> bytes:
+        return b"["
+
+    def write(self, entity: str, items: list[dict[str, Any]]) -> bytes:
+        nodes = []
+        for item in items:
+            node: dict[str, Any] = {"@id": item["id"], "@type": [CLASSES[entity]]}
+            for term, value in _fields(item):
+                if term.kind == "iri":
+                    node[term.iri] = [{"@id": value}]
+                elif term.kind == "json":
+                    node[term.iri] = [{"@value": value, "@type": "@json"}]
+                else:
+                    node[term.iri] = [{"@value": str(value)}]
+            nodes.append(json.dumps(node, ensure_ascii=False, separators=(",", ":")))
+        if not nodes:
+            return b""
+        chunk = ",".join(nodes)
+        if not self._first:
+            chunk = "," + chunk
+        self._first = False
+        return chunk.encode("utf-8")
+
+    def end(self) -> bytes:
+        return b"]"
+
+
+WRITERS = {
+    "nt": NTriplesWriter,
+    "ttl": TurtleWriter,
+    "jsonld-expanded": ExpandedJsonLdWriter,
+}
@@ -0,0 +1,149 @@
+from typing import Any, Sequence
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from celine.rec_registry.api.util import encode_json, JSON_MEDIA_TYPE, read_session
+from celine.rec_registry.db.models import Community, Meter, Participant, Site
+from celine.rec_registry.db.session import get_session
+from celine.rec_registry.schemas.resolve import IriResolveRequest, MeterResolveRequest
+from celine.rec_registry.services.queries import (
+    MODELS,
+    iri_locator,
+    projection,
+    to_items,
+)
+
+router = APIRouter(tags=["resolve"])
+
+
+async def _resolve_iris(
+    session: AsyncSession, iris: Sequence[str]
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Locate ``iris`` with one indexed UNION ALL, then load the matched records
+    by primary key (one projection query per entity type that matched).
+    """
+    hits = (await session.execute(iri_locator(iris))).all()
+    ids_by_entity: dict[str, list] = {}
+    for h in hits:
+        ids_by_entity.setdefault(h.entity, []).append(h.id)
+
+    records: dict[Any, dict[str, Any]] = {}
+    for entity, ids in ids_by_entity.items():
+        model = MODELS[entity]
+        q = (
+            projection(entity)
+            .add_columns(model.id.label("_pk"))
+            .where(model.id.in_(ids))
+        )
+        for item in to_items((await session.execute(q)).mappings().all()):
+            records[item.pop("_pk")] = item
+
+    resolved: dict[str, list[dict[str, Any]]] = {}
+    for h in hits:
+        resolved.setdefault(h.iri, []).append(
+            {"type": h.type, "community": h.community, "record": records.get(h.id)}
+        )
+    return resolved
+
+
+@router.get("/resolve")
+async def resolve_iri(
+    iri: str = Query(..., description="Absolute entity IRI"),
+    session: AsyncSession = Depends(read_session),
+):
+    """
+    Dereference an entity IRI (API-minted or explicit) to its type and record.
+    """
+    resolved = await _resolve_iris(session, [iri])
+    if iri not in resolved:
+        raise HTTPException(status_code=404, detail="IRI not found")
+    return Response(
+        content=encode_json({"iri": iri, "matches": resolved[iri]}),
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+@router.post("/resolve")
+async def resolve_iris(
+    payload: IriResolveRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Batch variant of ``GET /resolve``: matches grouped by IRI, plus misses.
+    """
+    iris = list(dict.fromkeys(payload.iris))
+    resolved = await _resolve_iris(session, iris) if iris else {}
+    result = {
+        "resolved": resolved,
+        "misses": [i for i in iris if i not in resolved],
+    }
+    return Response(content=encode_json(result), media_type=JSON_MEDIA_TYPE)
+
+
+@router.post("/meters/resolve")
+async def resolve_meters(
+    payload: MeterResolveRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Resolve sensor_ids and POD codes to meters across all communities in one query.
+
+    Matches are grouped by the requested value (a value may match meters in several
+    communities); values without a meter are listed under ``misses``.
+    """
+    sensor_ids = list(dict.fromkeys(payload.sensor_ids))
+    pods = list(dict.fromkeys(payload.pods))
+
+    matched: dict[str, dict[str, list[dict]]] = {"sensor_ids": {}, "pods": {}}
+    if sensor_ids or pods:
+        conds = []
+        if sensor_ids:
+            conds.append(Meter.sensor_id.in_(sensor_ids))
+        if pods:
+            conds.append(Meter.pod.in_(pods))
+        q = (
+            select(
+                Meter.sensor_id,
+                Meter.pod,
+                Meter.key,
+                Meter.iri,
+                Community.key.label("community"),
+                Participant.iri.label("owner"),
+                Site.iri.label("site"),
+            )
+            .join(Community, Meter.community_id == Community.id)
+            .join(Participant, Meter.owner_participant_id == Participant.id)
+            .outerjoin(Site, Meter.site_id == Site.id)
+            .where(or_(*conds))
+            .order_by(Community.key, Meter.key)
+        )
+        wanted_sensors = set(sensor_ids)
+        wanted_pods = set(pods)
+        for r in (await session.execute(q)).all():
+            hit = {
+                "community": r.community,
+                "key": r.key,
+                "iri": r.iri,
+                "owner": r.owner,
+                "site": r.site,
+            }
+            if r.sensor_id in wanted_sensors:
+                matched["sensor_ids"].setdefault(r.sensor_id, []).append(
+                    {**hit, "pod": r.pod}
+                )
+            if r.pod in wanted_pods:
+                matched["pods"].setdefault(r.pod, []).append(
+                    {**hit, "sensor_id": r.sensor_id}
+                )
+
+    result = {
+        **matched,
+        "misses": {
+            "sensor_ids": [v for v in sensor_ids if v not in matched["sensor_ids"]],
+            "pods": [v for v in pods if v not in matched["pods"]],
+        },
+    }
+    return Response(content=encode_json(result), media_type=JSON_MEDIA_TYPE)
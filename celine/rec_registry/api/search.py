@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from celine.rec_registry.api.pagination import decode_cursor, encode_cursor
+from celine.rec_registry.api.util import encode_json, JSON_MEDIA_TYPE, read_session
+from celine.rec_registry.services.search import (
+    MIN_QUERY_LENGTH,
+    SEARCHABLE,
+    search_query,
+)
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/search")
+async def search(
+    q: str = Query(
+        ...,
+        min_length=MIN_QUERY_LENGTH,
+        description="Case-insensitive substring of a name, area, key or POD code",
+    ),
+    type: str | None = Query(
+        default=None,
+        description=f"Comma-separated entity types ({', '.join(SEARCHABLE)})",
+    ),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    session: AsyncSession = Depends(read_session),
+):
+    """
+    Search participants, sites and meters across all communities.
+
+    Hits are ranked exact match > prefix > substring, then by type and IRI.
+    """
+    types = list(SEARCHABLE)
+    if type:
+        types = list(dict.fromkeys(t.strip() for t in type.split(",") if t.strip()))
+        unknown = [t for t in types if t not in SEARCHABLE]
+        if unknown or not types:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown type(s): {', '.join(unknown)}; "
+                f"available: {', '.join(SEARCHABLE)}",
+            )
+    # Cursors only apply to the query and types they were issued for
+    scope = f"search:{q}:{','.join(sorted(types))}"
+    after = None
+    if cursor:
+        after = decode_cursor(cursor, scope=scope)
+        if not (isinstance(after, list) and len(after) == 3):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = (
+        (await session.execute(search_query(q, types, limit=limit, after=after)))
+        .mappings()
+        .all()
+    )
+    items = [dict(r) for r in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            [last["score"], last["type"], last["iri"]], scope=scope
+        )
+    return Response(
+        content=encode_json({"items": items, "next_cursor": next_cursor}),
+        media_type=JSON_MEDIA_TYPE,
+    )
@@ -0,0 +1,140 @@
+"""
+Streaming bulk reads (NDJSON and RDF).
+
+Rows are fetched through a server-side cursor in batches of
+``settings.stream_batch_size`` and each batch is encoded and written as soon as
+it arrives, so memory stays flat and the first byte goes out after the first
+batch regardless of collection size.
+"""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from celine.rec_registry.api.rdf import WRITERS
+from celine.rec_registry.api.util import (
+    community_etag,
+    encode_json,
+    Fields,
+    NDJSON_MEDIA_TYPE,
+)
+from celine.rec_registry.core.settings import settings
+from celine.rec_registry.db.models import Community
+from celine.rec_registry.db.session import (
+    begin_snapshot,
+    SessionLocal,
+    sessionmaker_for,
+)
+from celine.rec_registry.services.community_cache import CommunityRef
+from celine.rec_registry.services.graph import COLLECTIONS
+from celine.rec_registry.services.queries import (
+    MODELS,
+    community_projection,
+    projection,
+    to_items,
+)
+
+# (entity, items) batches fed to the encoders
+Batches = AsyncIterator[tuple[str, list[dict[str, Any]]]]
+
+
+async def _partitions(session: AsyncSession, q: Select) -> AsyncIterator[list[Any]]:
+    result = await session.stream(
+        q.execution_options(yield_per=settings.stream_batch_size)
+    )
+    async for batch in result.mappings().partitions():
+        yield batch
+
+
+async def stream_rows(
+    q: Select, sessionmaker: async_sessionmaker = SessionLocal
+) -> AsyncIterator[list[Any]]:
+    """
+    Yield the rows of ``q`` as mapping batches from a server-side cursor.
+
+    The stream owns its session (from ``sessionmaker``): it outlives the
+    request-scoped one.
+    """
+    async with sessionmaker() as session:
+        async for batch in _partitions(session, q):
+            yield batch
+
+
+async def _entity_batches(
+    sessionmaker: async_sessionmaker,
+    entity: str,
+    q: Select,
+    selected: Fields,
+    constant: dict[str, Any],
+) -> Batches:
+    async for batch in stream_rows(q, sessionmaker):
+        yield entity, to_items(batch, selected, **constant)
+
+
+async def community_batches(
+    c: CommunityRef, sessionmaker: async_sessionmaker = SessionLocal
+) -> Batches:
+    """
+    The community item followed by every collection, read in one snapshot
+    transaction (as the graph endpoint does).
+    """
+    async with sessionmaker() as session:
+        await begin_snapshot(session)
+        q = projection("communities").where(Community.id == c.id)
+        yield "communities", to_items((await session.execute(q)).mappings().all())
+        for entity in COLLECTIONS:
+            q = community_projection(entity, c.id).order_by(MODELS[entity].key)
+            constant = {"community": c.iri} if entity == "memberships" else {}
+            async for batch in _partitions(session, q):
+                yield entity, to_items(batch, None, **constant)
+
+
+async def _ndjson_lines(batches: Batches) -> AsyncIterator[bytes]:
+    async for _, items in batches:
+        yield b"".join(encode_json(item) + b"\n" for item in items)
+
+
+async def _rdf_chunks(fmt: str, batches: Batches) -> AsyncIterator[bytes]:
+    writer = WRITERS[fmt]()
+    yield writer.start()
+    async for entity, items in batches:
+        chunk = writer.write(entity, items)
+        if chunk:
+            yield chunk
+    yield writer.end()
+
+
+def batches_response(c: CommunityRef, fmt: str, batches: Batches) -> StreamingResponse:
+    """
+    Stream ``batches`` as NDJSON items or as the ``fmt`` RDF serialization.
+    """
+    if fmt == "ndjson":
+        body, media_type = _ndjson_lines(batches), NDJSON_MEDIA_TYPE
+    else:
+        body, media_type = _rdf_chunks(fmt, batches), WRITERS[fmt].media_type
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"ETag": community_etag(c, fmt), "Vary": "Accept"},
+    )
+
+
+def streamed_response(
+    session: AsyncSession,
+    c: CommunityRef,
+    fmt: str,
+    entity: str,
+    q: Select,
+    selected: Fields,
+    **constant: Any,
+) -> StreamingResponse:
+    """
+    Stream every row of ``q`` (already filtered and ordered) as ``fmt``
+    (``ndjson`` or an RDF format), from the database ``session`` reads from.
+    """
+    batches = _entity_batches(sessionmaker_for(session), entity, q, selected, constant)
+    return batches_response(c, fmt, batches)
@@ -1,8 +1,72 @@
-from fastapi import Query
-from typing import Literal, Any
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+from fastapi import Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Any, Hashable, get_args
 from celine.rec_registry.api.render import jsonld
+from celine.rec_registry.core.compression import (
+    compress,
+    compressible,
+    negotiate,
+    weak_etag,
+)
+from celine.rec_registry.core.settings import settings
+from celine.rec_registry.db.models import Community
+from celine.rec_registry.db.session import read_sessionmaker, SessionLocal
+from celine.rec_registry.services.community_cache import (
+    CommunityRef,
+    resolve_community,
+)
+from celine.rec_registry.services.response_cache import CachedBody, response_cache
+from celine.rec_registry.services.queries import extra_document, select_fields
 
 Format = Literal["json", "jsonld"]
+ListFormat = Literal["json", "jsonld", "ndjson", "ttl", "nt", "jsonld-expanded"]
+GraphFormat = Literal["json", "jsonld", "ttl", "nt", "jsonld-expanded"]
+ExportFormat = Literal["yaml", "ttl", "nt", "jsonld-expanded"]
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# RDF serializations, see api/rdf.py
+RDF_FORMATS = frozenset({"ttl", "nt", "jsonld-expanded"})
+
+# Representations written incrementally; never buffered into the response cache
+STREAMED_VARIANTS = frozenset({"ndjson", *RDF_FORMATS})
+
+# Accept media type marker -> format, in negotiation order
+ACCEPT_FORMATS = (
+    (NDJSON_MEDIA_TYPE, "ndjson"),
+    ("text/turtle", "ttl"),
+    ("application/n-triples", "nt"),
+    ("json-ld#expanded", "jsonld-expanded"),
+)
+
+# Sparse fieldset selected by fields_param (None: full representation)
+Fields = tuple[str, ...] | None
+
+# (path, value) pairs of ?extra.<path>=<value> filters, sorted (hashable cache key part)
+ExtraFilters = tuple[tuple[str, str], ...]
+
+EXTRA_PREFIX = "extra."
+
+
+def _pattern(formats: Any) -> str:
+    return "^(" + "|".join(get_args(formats)) + ")$"
+
+
+def _negotiate(request: Request, allowed: Any, default: str) -> str:
+    accept = request.headers.get("accept", "")
+    for marker, fmt in ACCEPT_FORMATS:
+        if fmt in get_args(allowed) and marker in accept:
+            return fmt
+    return default
 
 
 def format_param(
@@ -11,5 +75,242 @@ def format_param(
     return format
 
 
+def list_format_param(
+    request: Request,
+    format: ListFormat | None = Query(
+        default=None,
+        pattern=_pattern(ListFormat),
+        description="Defaults from Accept (application/x-ndjson and the RDF media "
+        "types stream every row)",
+    ),
+) -> ListFormat:
+    return format or _negotiate(request, ListFormat, "json")
+
+
+def graph_format_param(
+    request: Request,
+    format: GraphFormat | None = Query(
+        default=None,
+        pattern=_pattern(GraphFormat),
+        description="Defaults from Accept (text/turtle, application/n-triples)",
+    ),
+) -> GraphFormat:
+    return format or _negotiate(request, GraphFormat, "json")
+
+
+def export_format_param(
+    request: Request,
+    format: ExportFormat | None = Query(
+        default=None,
+        pattern=_pattern(ExportFormat),
+        description="Defaults from Accept (text/turtle, application/n-triples)",
+    ),
+) -> ExportFormat:
+    return format or _negotiate(request, ExportFormat, "yaml")
+
+
+def rdf_fields(fmt: str, selected: Fields) -> Fields:
+    """
+    RDF nodes need their subject: keep ``id`` in a sparse selection.
+    """
+    if fmt in RDF_FORMATS and selected is not None and "id" not in selected:
+        return ("id", *selected)
+    return selected
+
+
 def maybe_jsonld(fmt: Format, payload: dict[str, Any]) -> dict[str, Any]:
     return jsonld(payload) if fmt == "jsonld" else payload
+
+
+def fields_param(entity: str):
+    """
+    Dependency for ``?fields=`` / ``?include_extra=`` on ``entity`` list and detail reads.
+    """
+
+    def dependency(
+        fields: str | None = Query(
+            default=None,
+            description="Comma-separated response fields (key is always included)",
+        ),
+        include_extra: bool = Query(
+            default=True, description="Include the extra object"
+        ),
+    ) -> Fields:
+        try:
+            return select_fields(entity, fields, include_extra)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return dependency
+
+
+def extra_filters_param(request: Request) -> ExtraFilters:
+    """
+    Dependency collecting ``?extra.<path>=<value>`` filters.
+
+    Paths are dot-separated, ``name[]`` matches any array element, e.g.
+    ``?extra.tariff=BTA&extra.datasets[].id=ds-1``.
+    """
+    filters = tuple(
+        sorted(
+            (name[len(EXTRA_PREFIX) :], value)
+            for name, value in request.query_params.multi_items()
+            if name.startswith(EXTRA_PREFIX)
+        )
+    )
+    try:
+        extra_document(filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return filters
+
+
+MIN_REVISION_HEADER = "x-min-revision"
+
+
+async def read_session(request: Request):
+    """
+    Session for GET handlers: a read replica (round robin) when configured.
+
+    ``X-Min-Revision: <n>`` gives read-your-writes after an import: if the
+    replica's revision of the ``{community_key}`` community is older than ``n``
+    (or the route has no community), the primary serves the request instead.
+    """
+    min_revision = request.headers.get(MIN_REVISION_HEADER)
+    wanted = None
+    if min_revision is not None:
+        # Validated whether or not replicas are configured
+        try:
+            wanted = int(min_revision)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid X-Min-Revision")
+    maker = read_sessionmaker()
+    if wanted is None or maker is SessionLocal:
+        async with maker() as session:
+            yield session
+        return
+
+    key = request.path_params.get("community_key")
+    async with maker() as session:
+        revision = None
+        if key is not None:
+            revision = await session.scalar(
+                select(Community.revision).where(Community.key == key)
+            )
+        if revision is not None and revision >= wanted:
+            yield session
+            return
+    async with SessionLocal() as session:
+        yield session
+
+
+async def community_ref(
+    community_key: str,
+    session: AsyncSession = Depends(read_session),
+) -> CommunityRef:
+    c = await resolve_community(session, community_key)
+    if c is None:
+        raise HTTPException(status_code=404, detail="Community not found")
+    return c
+
+
+def community_etag(c: CommunityRef, variant: str = "json") -> str:
+    """
+    Strong ETag of the ``variant`` representation of one community revision.
+    """
+    if variant == "json":
+        return f'"{c.id.hex}-{c.revision}"'
+    return f'"{c.id.hex}-{c.revision}-{variant}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def cached_response(
+    request: Request, c: CommunityRef, key: tuple[Hashable, ...], variant: str = "json"
+) -> Response | None:
+    """
+    Short-circuit a read scoped to community ``c``.
+
+    Returns 304 when ``If-None-Match`` matches the current revision, the cached
+    body when ``key`` was rendered before at this revision (in the negotiated
+    content coding), or None when the handler has to query and call
+    :func:`store_response` (or stream).
+    """
+    etag = community_etag(c, variant)
+    headers = {"ETag": etag, "Vary": "Accept"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if variant in STREAMED_VARIANTS:
+        return None
+    entry = response_cache.get((c.id, c.revision, *key))
+    if entry is None:
+        return None
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    if (
+        encoding is None
+        or len(entry.body) < settings.compression_min_size
+        or not compressible(entry.media_type)
+    ):
+        return Response(
+            content=entry.body, media_type=entry.media_type, headers=headers
+        )
+    # Compressed variants are cached next to the identity body, compressed once
+    encoded_key = (c.id, c.revision, *key, encoding)
+    encoded = response_cache.peek(encoded_key)
+    if encoded is None:
+        encoded = CachedBody(compress(entry.body, encoding), entry.media_type)
+        response_cache.put(encoded_key, encoded)
+    headers.update(
+        {
+            "ETag": weak_etag(etag),
+            "Content-Encoding": encoding,
+            "Vary": "Accept, Accept-Encoding",
+        }
+    )
+    return Response(
+        content=encoded.body, media_type=encoded.media_type, headers=headers
+    )
+
+
+def store_response(
+    c: CommunityRef,
+    key: tuple[Hashable, ...],
+    body: bytes,
+    media_type: str,
+    variant: str = "json",
+) -> Response:
+    response_cache.put((c.id, c.revision, *key), CachedBody(body, media_type))
+    return Response(
+        content=body,
+        media_type=media_type,
+        headers={"ETag": community_etag(c, variant), "Vary": "Accept"},
+    )
+
+
+def encode_json(payload: Any) -> bytes:
+    """
+    Encode a response payload of plain JSON types (no ``jsonable_encoder`` walk).
+
+    Uses orjson when installed (``speedups`` extra), the stdlib otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(
+        payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def json_response(
+    c: CommunityRef, key: tuple[Hashable, ...], fmt: Format, payload: dict[str, Any]
+) -> Response:
+    return store_response(
+        c, key, encode_json(maybe_jsonld(fmt, payload)), JSON_MEDIA_TYPE, fmt
+    )
@@ -40,10 +40,15 @@ def import_bundle(
         "http://localhost:8000", "--api", help="Registry API base URL"
     ),
     dry_run: bool = typer.Option(False, "--dry-run", help="Validate without writing"),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Update only changed rows instead of replacing the community",
+    ),
     timeout: float = typer.Option(60.0, "--timeout", help="HTTP timeout seconds"),
 ):
     """
-    Import a Greenland-style YAML bundle via /admin/import (JSON payload: bundle + dry_run).
+    Import a Greenland-style YAML bundle via /admin/import (JSON payload: bundle + dry_run + mode).
     """
     yaml_text = file.read_text(encoding="utf-8")
     bundle = yaml.safe_load(yaml_text) or {}
@@ -54,7 +59,11 @@ def import_bundle(
         raise typer.Exit(1)
 
     url = _api_url(api, "/admin/import")
-    payload = {"bundle": bundle, "dry_run": dry_run}
+    payload = {
+        "bundle": bundle,
+        "dry_run": dry_run,
+        "mode": "incremental" if incremental else "replace",
+    }
 
     try:
         r = httpx.post(url, json=payload, timeout=timeout)
@@ -125,6 +134,22 @@ def _group_meters_by_owner(
     return out
 
 
+def _deref(
+    items: list[dict[str, Any]], targets: dict[str, list[dict[str, Any]]]
+) -> list[dict[str, Any]]:
+    """
+    Replace graph index references with the referenced entity IRI.
+    """
+    out = []
+    for item in items:
+        item = dict(item)
+        for field, target in targets.items():
+            idx = item.get(field)
+            item[field] = target[idx].get("iri") if isinstance(idx, int) else None
+        out.append(item)
+    return out
+
+
 @app.command("tree")
 def community_tree(
     community: str = typer.Option(..., "--community", "-c", help="Community key"),
@@ -132,41 +157,30 @@ def community_tree(
         "http://localhost:8000", "--api", help="Registry API base URL"
     ),
     timeout: float = typer.Option(30.0, "--timeout", help="HTTP timeout seconds"),
-    max_items: int = typer.Option(
-        500, "--max-items", min=1, max=5000, help="Max items per subleaf fetch"
+    max_items: int | None = typer.Option(
+        None,
+        "--max-items",
+        hidden=True,
+        help="Deprecated; the graph is never truncated",
     ),
 ):
     """
     Show a simplified community tree (community -> participants -> meters/assets).
-    Pulls subleafs using minimal queries (no ?include).
+    Pulls the whole community with a single GET /communities/{key}/graph.
     """
     with httpx.Client(timeout=timeout) as client:
-        c = _get_json(client, _api_url(api, f"/communities/{community}"))
-        participants = _get_json(
+        graph = _get_json(
             client,
-            _api_url(api, f"/communities/{community}/participants"),
-            params={"limit": max_items},
-        ).get("items", [])
-        memberships = _get_json(
-            client,
-            _api_url(api, f"/communities/{community}/memberships"),
-            params={"limit": max_items},
-        ).get("items", [])
-        sites = _get_json(
-            client,
-            _api_url(api, f"/communities/{community}/sites"),
-            params={"limit": max_items},
-        ).get("items", [])
-        assets = _get_json(
-            client,
-            _api_url(api, f"/communities/{community}/assets"),
-            params={"limit": max_items},
-        ).get("items", [])
-        meters = _get_json(
-            client,
-            _api_url(api, f"/communities/{community}/meters"),
-            params={"limit": max_items},
-        ).get("items", [])
+            _api_url(api, f"/communities/{community}/graph"),
+            params={"include_extra": "false"},
+        )
+
+    c = graph.get("community", {})
+    participants = graph.get("participants", [])
+    sites = graph.get("sites", [])
+    memberships = _deref(graph.get("memberships", []), {"participant": participants})
+    assets = _deref(graph.get("assets", []), {"owner": participants, "site": sites})
+    meters = _deref(graph.get("meters", []), {"owner": participants, "site": sites})
 
     # Indexes
     participant_by_iri = {p.get("iri"): p for p in participants if p.get("iri")}
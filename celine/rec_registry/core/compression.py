@@ -0,0 +1,255 @@
+"""
+Negotiated response compression.
+
+gzip is always available; zstd and brotli are offered when ``zstandard`` /
+``brotli`` are installed (``compression`` extra). The encoding is chosen from
+``Accept-Encoding`` (q-values first, then ``settings.compression_encodings``
+order). Streamed responses are compressed chunk by chunk with a flush after
+each one, so clients still receive rows as they are produced.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Any
+
+try:
+    import brotli
+except ImportError:  # optional codec
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional codec
+    zstandard = None
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from celine.rec_registry.core.settings import settings
+
+# Media types worth compressing (prefix match on the Content-Type)
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/ld+json",
+    "application/x-ndjson",
+    "application/n-triples",
+    "application/yaml",
+)
+
+
+class _Gzip:
+    def __init__(self) -> None:
+        self._c = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+class _Brotli:
+    def __init__(self) -> None:
+        self._c = brotli.Compressor(quality=settings.compression_brotli_quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+class _Zstd:
+    def __init__(self) -> None:
+        self._c = zstandard.ZstdCompressor(
+            level=settings.compression_zstd_level
+        ).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+CODECS: dict[str, Any] = {"gzip": _Gzip}
+if brotli is not None:
+    CODECS["br"] = _Brotli
+if zstandard is not None:
+    CODECS["zstd"] = _Zstd
+
+
+def enabled_encodings() -> list[str]:
+    """
+    Configured encodings that have a codec here, in preference order.
+    """
+    names = [e.strip() for e in settings.compression_encodings.split(",")]
+    return [e for e in names if e in CODECS]
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """
+    Best content coding for an ``Accept-Encoding`` header, or None for identity.
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in enabled_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compressible(media_type: str | None) -> bool:
+    return bool(media_type) and media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    c = CODECS[encoding]()
+    return c.compress(body) + c.finish()
+
+
+def weak_etag(etag: str) -> str:
+    """
+    Compressed bytes differ from the identity ones: keep the validator, but weak.
+    """
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def add_vary(headers: MutableHeaders, value: str) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["vary"] = value
+    elif value.lower() not in (v.strip().lower() for v in vary.split(",")):
+        headers["vary"] = f"{vary}, {value}"
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI compression of eligible responses.
+
+    Responses that already carry ``Content-Encoding`` (e.g. compressed variants
+    served from the response cache) pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int | None = None):
+        self.app = app
+        self.minimum_size = (
+            settings.compression_min_size if minimum_size is None else minimum_size
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        await self.app(scope, receive, _Responder(send, encoding, self.minimum_size))
+
+
+class _Responder:
+    """
+    ``send`` wrapper: holds the response start back until enough of the body is
+    known to decide whether (and how) to compress it.
+    """
+
+    def __init__(self, send: Send, encoding: str | None, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Message | None = None
+        self.pending: list[bytes] = []
+        self.pending_size = 0
+        self.compressor: Any = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is None:
+            # Headers already sent: passthrough or streaming compression
+            if self.compressor is None:
+                await self.send(message)
+                return
+            data = self.compressor.compress(body)
+            data += self.compressor.flush() if more_body else self.compressor.finish()
+            await self.send({**message, "body": data})
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        status = self.start["status"]
+        eligible = (
+            status not in (204, 304)
+            and "content-encoding" not in headers
+            and compressible(headers.get("content-type"))
+        )
+        if not self.pending and (eligible or status == 304):
+            add_vary(headers, "Accept-Encoding")
+        length = headers.get("content-length")
+        if (
+            not eligible
+            or self.encoding is None
+            or (length is not None and int(length) < self.minimum_size)
+        ):
+            await self._send_start()
+            await self.send(message)
+            return
+
+        # Small bodies may arrive in several chunks: buffer up to the threshold
+        self.pending.append(body)
+        self.pending_size += len(body)
+        if more_body and self.pending_size < self.minimum_size:
+            return
+        body = b"".join(self.pending)
+        self.pending = []
+        if not more_body and len(body) < self.minimum_size:
+            await self._send_start()
+            await self.send({**message, "body": body})
+            return
+
+        headers["content-encoding"] = self.encoding
+        if "etag" in headers:
+            headers["etag"] = weak_etag(headers["etag"])
+        self.compressor = CODECS[self.encoding]()
+        data = self.compressor.compress(body)
+        if more_body:
+            if "content-length" in headers:
+                del headers["content-length"]
+            data += self.compressor.flush()
+        else:
+            data += self.compressor.finish()
+            headers["content-length"] = str(len(data))
+        await self._send_start()
+        await self.send({**message, "body": data})
+
+    async def _send_start(self) -> None:
+        start, self.start = self.start, None
+        await self.send(start)
@@ -0,0 +1,378 @@
+"""
+Prometheus metrics in the text exposition format (0.0.4).
+
+Metrics are plain in-process counters: a labelled child is created once per
+label-value tuple and kept, so the hot path is a dict lookup plus an increment
+and label strings are only rendered when ``/metrics`` is scraped. Values are
+per worker process; Prometheus aggregates across instances.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, Mapping
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from celine.rec_registry.db.pool import pool_status
+from celine.rec_registry.db.statements import request_stats
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+IMPORT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Route label of requests that matched no route (keeps cardinality bounded)
+UNMATCHED = "<unmatched>"
+
+# Methods reported as themselves; anything else is "OTHER"
+METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+# Samples yielded by collectors: (label values, value)
+Samples = Iterable[tuple[tuple[Any, ...], float]]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[Any, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # One slot per bucket plus +Inf; made cumulative when rendered
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum: float = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[tuple[Any, ...], Any] = {}
+
+    def _child(self) -> Any:
+        return _Value()
+
+    def labels(self, *values: Any) -> Any:
+        """
+        Child for one label-value tuple (created on first use, then reused).
+        """
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._child()
+        return child
+
+    def samples(self) -> Samples:
+        return ((values, child.value) for values, child in self._children.items())
+
+    def render(self, out: list[str]) -> None:
+        out.append(f"# HELP {self.name} {self.help}")
+        out.append(f"# TYPE {self.name} {self.type}")
+        for values, value in self.samples():
+            out.append(
+                f"{self.name}{_labels(self.labelnames, values)} {_number(value)}"
+            )
+
+
+class Counter(Metric):
+    type = "counter"
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+
+class CallbackGauge(Gauge):
+    """
+    Gauge read at scrape time from ``collect()`` (e.g. live pool counts).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...],
+        collect: Callable[[], Samples],
+    ):
+        super().__init__(name, help, labelnames)
+        self.collect = collect
+
+    def samples(self) -> Samples:
+        return self.collect()
+
+
+class CallbackCounter(CallbackGauge):
+    """
+    Counter kept elsewhere (e.g. ``PoolStats``), read at scrape time.
+    """
+
+    type = "counter"
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self) -> Any:
+        return _HistogramValue(self.buckets)
+
+    def render(self, out: list[str]) -> None:
+        out.append(f"# HELP {self.name} {self.help}")
+        out.append(f"# TYPE {self.name} {self.type}")
+        bounds = [*(_number(b) for b in self.buckets), "+Inf"]
+        for values, child in list(self._children.items()):
+            total = 0
+            for bound, count in zip(bounds, child.counts):
+                total += count
+                le = _labels(self.labelnames, values, f'le="{bound}"')
+                out.append(f"{self.name}_bucket{le} {total}")
+            labels = _labels(self.labelnames, values)
+            out.append(f"{self.name}_sum{labels} {_number(child.sum)}")
+            out.append(f"{self.name}_count{labels} {total}")
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> bytes:
+        out: list[str] = []
+        for metric in self._metrics.values():
+            metric.render(out)
+        out.append("")
+        return "\n".join(out).encode("utf-8")
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being served")
+).labels()
+HTTP_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template, method and status",
+        ("route", "method", "status"),
+    )
+)
+HTTP_RESPONSE_SIZE = REGISTRY.register(
+    Histogram(
+        "http_response_size_bytes",
+        "HTTP response body size on the wire by route template and method",
+        ("route", "method"),
+        SIZE_BUCKETS,
+    )
+)
+HTTP_REQUEST_DB_QUERIES = REGISTRY.register(
+    Histogram(
+        "http_request_db_queries",
+        "SQL statements executed per HTTP request by route template",
+        ("route",),
+        QUERY_COUNT_BUCKETS,
+    )
+)
+HTTP_REQUEST_DB_DURATION = REGISTRY.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Time spent in SQL statements per HTTP request by route template",
+        ("route",),
+    )
+)
+DB_QUERY_DURATION = REGISTRY.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "SQL statement execution time by database",
+        ("db",),
+    )
+)
+IMPORT_DURATION = REGISTRY.register(
+    Histogram(
+        "import_duration_seconds",
+        "Bundle import duration by mode and outcome",
+        ("mode", "outcome"),
+        IMPORT_BUCKETS,
+    )
+)
+IMPORT_ROWS = REGISTRY.register(
+    Counter(
+        "import_rows_total",
+        "Rows written by bundle imports by entity type and operation",
+        ("entity", "op"),
+    )
+)
+
+# Instrumented engines by database label, for the pool gauges
+_engines: dict[str, AsyncEngine] = {}
+
+
+def _pool_samples() -> Samples:
+    for db, engine in _engines.items():
+        status = pool_status(engine.sync_engine.pool)
+        for state in ("in_use", "idle", "overflow"):
+            if state in status:
+                yield (db, state), status[state]
+
+
+def _pool_counters(field: str) -> Callable[[], Samples]:
+    def collect() -> Samples:
+        for db, engine in _engines.items():
+            stats = getattr(engine.sync_engine.pool, "pool_stats", None)
+            if stats is not None:
+                yield (db,), getattr(stats, field)
+
+    return collect
+
+
+REGISTRY.register(
+    CallbackGauge(
+        "db_pool_connections",
+        "Pooled connections by database and state",
+        ("db", "state"),
+        _pool_samples,
+    )
+)
+REGISTRY.register(
+    CallbackCounter(
+        "db_pool_checkout_wait_seconds_total",
+        "Time spent waiting for a pooled connection",
+        ("db",),
+        _pool_counters("wait_total"),
+    )
+)
+REGISTRY.register(
+    CallbackCounter(
+        "db_pool_timeouts_total",
+        "Pool checkouts that timed out",
+        ("db",),
+        _pool_counters("timeouts"),
+    )
+)
+
+
+def watch_engine(engine: AsyncEngine, db: str) -> Callable[[float], None]:
+    """
+    Report the pool of ``engine`` (labelled ``db``) and return the statement
+    latency observer to pass to ``db.statements.instrument_engine``.
+    """
+    _engines[db] = engine
+    return DB_QUERY_DURATION.labels(db).observe
+
+
+def observe_import(
+    seconds: float,
+    deleted: Mapping[str, int],
+    inserted: Mapping[str, int],
+    dry_run: bool = False,
+    mode: str = "replace",
+    updated: Mapping[str, int] | None = None,
+) -> None:
+    """
+    Record one import: its duration and the per-entity counts of its report.
+    """
+    IMPORT_DURATION.labels(mode, "dry_run" if dry_run else "ok").observe(seconds)
+    if dry_run:
+        return
+    ops = (("deleted", deleted), ("inserted", inserted), ("updated", updated or {}))
+    for op, counts in ops:
+        for entity, n in counts.items():
+            IMPORT_ROWS.labels(entity, op).inc(n)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI request metrics; add it last so it wraps the whole stack.
+
+    The route label is the matched route template (``/communities/{key}/...``),
+    read from the scope after routing, so concrete paths never become labels.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        t0 = time.perf_counter()
+        with request_stats() as stats:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                elapsed = time.perf_counter() - t0
+                HTTP_REQUESTS_IN_FLIGHT.dec()
+                route = getattr(scope.get("route"), "path", UNMATCHED)
+                method = scope["method"] if scope["method"] in METHODS else "OTHER"
+                HTTP_REQUEST_DURATION.labels(route, method, status).observe(elapsed)
+                HTTP_RESPONSE_SIZE.labels(route, method).observe(size)
+                HTTP_REQUEST_DB_QUERIES.labels(route).observe(stats.statements)
+                HTTP_REQUEST_DB_DURATION.labels(route).observe(stats.seconds)
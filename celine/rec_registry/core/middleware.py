@@ -1,32 +1,97 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from celine.rec_registry.db.statements import request_stats
 from .policy import AccessPolicy
+from .settings import settings
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# POST endpoints that only read (batch lookups taking a JSON body): treated as
+# reads, so resolving needs no write access
+READ_ONLY_POSTS = frozenset({"/resolve", "/meters/resolve"})
+
 
+class PolicyMiddleware:
+    """
+    Pure ASGI access control: admin paths and write methods go through the
+    ``AccessPolicy`` (except ``READ_ONLY_POSTS``); every other request is
+    passed on untouched.
 
-class PolicyMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, policy: AccessPolicy | None = None):
-        super().__init__(app)
+    The policy sees a ``Request`` built from the scope only (headers, path,
+    query), so the body stays unread for the endpoint.
+    """
+
+    def __init__(self, app: ASGIApp, policy: AccessPolicy | None = None):
+        self.app = app
         self.policy = policy or AccessPolicy()
 
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-        method = request.method.upper()
-        is_admin = path.startswith("/admin")
-        is_write = method in {"POST", "PUT", "PATCH", "DELETE"}
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        is_admin = scope["path"].startswith("/admin")
+        is_write = (
+            scope["method"] in WRITE_METHODS
+            and scope["path"].rstrip("/") not in READ_ONLY_POSTS
+        )
+        if not (is_admin or is_write):
+            await self.app(scope, receive, send)
+            return
 
+        request = Request(scope)
         if is_admin:
             d = await self.policy.allow_admin(request)
             if not d.allowed:
-                return JSONResponse(
+                response = JSONResponse(
                     {"detail": d.reason or "Admin access denied"}, status_code=403
                 )
-
-        if is_write and not is_admin:
+                await response(scope, receive, send)
+                return
+        else:
             d = await self.policy.allow_write(request)
             if not d.allowed:
-                return JSONResponse(
+                response = JSONResponse(
                     {"detail": d.reason or "Write access denied"}, status_code=403
                 )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+
+class StatementStatsMiddleware:
+    """
+    Collects the SQL statements of each request (see ``db/statements.py``) and,
+    with ``settings.server_timing``, reports them in a ``Server-Timing`` header.
+
+    The header is written when the response starts, so statements run by a
+    streamed body afterwards are not included.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool | None = None):
+        self.app = app
+        self.server_timing = (
+            settings.server_timing if server_timing is None else server_timing
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with request_stats() as stats:
+            if not self.server_timing:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("server-timing", stats.server_timing())
+                await send(message)
 
-        return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,16 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from typing import Awaitable, Callable
+
 from fastapi import Request
 
+from celine.rec_registry.core.settings import settings
+
 
 @dataclass(frozen=True)
 class Decision:
@@ -14,3 +24,131 @@ class AccessPolicy:
 
     async def allow_write(self, request: Request) -> Decision:
         return Decision(True)
+
+
+def _retrieve(task: asyncio.Task) -> None:
+    # Callers re-raise upstream errors; don't log them again if all went away
+    if not task.cancelled():
+        task.exception()
+
+
+# (credential fingerprint, check, method, path class)
+DecisionKey = tuple[str, str, str, str]
+
+
+class CachedAccessPolicy(AccessPolicy):
+    """
+    Decision cache in front of an upstream ``AccessPolicy`` (e.g. token introspection).
+
+    Decisions are keyed on a fingerprint of the request credentials plus method and
+    path class, kept for ``allow_ttl`` / ``deny_ttl`` seconds in a bounded LRU.
+    Concurrent misses for the same key share one upstream call, which outlives any
+    caller that goes away. Upstream errors are propagated to every waiter and never
+    cached.
+    """
+
+    # Request headers that carry credentials
+    CREDENTIAL_HEADERS = ("authorization", "cookie", "x-api-key")
+
+    def __init__(
+        self,
+        policy: AccessPolicy,
+        *,
+        max_entries: int | None = None,
+        allow_ttl: float | None = None,
+        deny_ttl: float | None = None,
+    ):
+        self.policy = policy
+        self.max_entries = (
+            settings.policy_cache_size if max_entries is None else max_entries
+        )
+        self.allow_ttl = (
+            settings.policy_cache_allow_ttl if allow_ttl is None else allow_ttl
+        )
+        self.deny_ttl = settings.policy_cache_deny_ttl if deny_ttl is None else deny_ttl
+        self._entries: OrderedDict[DecisionKey, tuple[float, Decision]] = OrderedDict()
+        self._inflight: dict[DecisionKey, asyncio.Task[Decision]] = {}
+
+    def fingerprint(self, request: Request) -> str:
+        """
+        Digest of the request credentials; raw tokens are never kept in memory.
+        """
+        h = hashlib.sha256()
+        for name in self.CREDENTIAL_HEADERS:
+            h.update(request.headers.get(name, "").encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+
+    def path_class(self, request: Request) -> str:
+        """
+        Coarse path bucket decisions apply to: the first two path segments
+        (``/admin/import``, ``/communities/<key>``).
+        """
+        return "/" + "/".join(request.url.path.strip("/").split("/")[:2])
+
+    async def allow_admin(self, request: Request) -> Decision:
+        return await self._decide("admin", request, self.policy.allow_admin)
+
+    async def allow_write(self, request: Request) -> Decision:
+        return await self._decide("write", request, self.policy.allow_write)
+
+    async def _decide(
+        self,
+        check: str,
+        request: Request,
+        upstream: Callable[[Request], Awaitable[Decision]],
+    ) -> Decision:
+        key = (
+            self.fingerprint(request),
+            check,
+            request.method,
+            self.path_class(request),
+        )
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        # The upstream call runs in its own task so that a cancelled caller
+        # (client gone) never cancels it for the other callers sharing it
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.create_task(self._upstream(key, request, upstream))
+            pending.add_done_callback(_retrieve)
+            self._inflight[key] = pending
+        return await asyncio.shield(pending)
+
+    async def _upstream(
+        self,
+        key: DecisionKey,
+        request: Request,
+        upstream: Callable[[Request], Awaitable[Decision]],
+    ) -> Decision:
+        try:
+            decision = await upstream(request)
+        finally:
+            self._inflight.pop(key, None)
+        self._put(key, decision)
+        return decision
+
+    def _get(self, key: DecisionKey) -> Decision | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, decision = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return decision
+
+    def _put(self, key: DecisionKey, decision: Decision) -> None:
+        ttl = self.allow_ttl if decision.allowed else self.deny_ttl
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, decision)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,14 +1,81 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Public placeholder; cursors signed with it can be forged (warned about at startup)
+DEFAULT_CURSOR_SECRET = "celine-rec-registry"
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    # Postgres (asyncpg), or SQLite through aiosqlite ("sqlite" extra), e.g.
+    # sqlite+aiosqlite:///registry.db or sqlite+aiosqlite:// (in-memory, for tests)
     database_url: str = (
         "postgresql+asyncpg://postgres:postgres@db:5432/celine_rec_registry"
     )
     base_url: str = "http://localhost:8000"
     jsonld_context_url: str = "https://celine-eu.github.io/ontologies/celine.jsonld"
 
+    # Comma-separated read replica URLs for GET traffic (empty: read from the primary)
+    read_database_urls: str = ""
+
+    # Connection pool, per engine (primary and each replica). Pre-ping costs one round
+    # trip per checkout; recycle (seconds, -1 never) is the cheaper way to drop stale
+    # connections behind proxies with idle timeouts
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = False
+    # asyncpg prepared statement cache per connection (0 disables, e.g. behind pgbouncer
+    # in transaction mode)
+    db_prepared_statement_cache_size: int = 500
+
+    # HMAC key for opaque pagination cursors; set a private value in production, the
+    # same on every worker and instance behind one load balancer (a cursor from one
+    # is only valid on the others if they share the key)
+    cursor_secret: str = DEFAULT_CURSOR_SECRET
+
+    # Community key -> id cache; invalidated across workers via "postgres" (LISTEN/NOTIFY)
+    # or only in-process with "local"
+    community_cache_size: int = 1024
+    community_cache_ttl: float = 300.0
+    community_cache_bus: str = "postgres"
+    # Replica-resolved entries expire sooner: a lagging replica may repopulate an old
+    # revision right after an invalidation
+    community_cache_replica_ttl: float = 5.0
+
+    # Encoded response cache budget in bytes (0 disables it)
+    response_cache_bytes: int = 0
+
+    # Rows fetched per server-side cursor batch by streaming (NDJSON) reads
+    stream_batch_size: int = 1000
+
+    # Max identifiers accepted by one batch resolution request
+    resolve_max_items: int = 1000
+
+    # Authorization decision cache in front of the AccessPolicy (size 0 disables it);
+    # denials get a shorter TTL so fixed credentials take effect quickly
+    policy_cache_size: int = 4096
+    policy_cache_allow_ttl: float = 60.0
+    policy_cache_deny_ttl: float = 5.0
+
+    # Response compression: accepted codings in preference order (zstd / br need the
+    # "compression" extra; empty disables), smallest body compressed, codec levels
+    compression_encodings: str = "zstd,br,gzip"
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+    compression_zstd_level: int = 3
+
+    # Prometheus /metrics endpoint and the request/DB instrumentation behind it
+    metrics_enabled: bool = True
+
+    # SQL statements per request: Server-Timing response header, slow statement log
+    # threshold in ms (0 disables), and a dev/test N+1 guard failing a request that
+    # runs one statement more than this many times (0 disables)
+    server_timing: bool = False
+    slow_query_ms: float = 0.0
+    sql_repeat_limit: int = 0
+
 
 settings = Settings()
@@ -3,20 +3,41 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import String, ForeignKey, UniqueConstraint, Index, Text
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import (
+    Integer,
+    JSON,
+    String,
+    ForeignKey,
+    UniqueConstraint,
+    Index,
+    Text,
+    Uuid,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from celine.rec_registry.db.session import Base
 
+# Portable column types: native UUID / JSONB on Postgres, CHAR(32) / JSON text on
+# SQLite. Postgres-only index options (GIN, hash, operator classes) are ignored
+# elsewhere.
+UUID = Uuid(as_uuid=True)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 
 class Community(Base):
     __tablename__ = "community"
-
-    id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    __table_args__ = (
+        Index(
+            "ix_community_extra",
+            "extra",
+            postgresql_using="gin",
+            postgresql_ops={"extra": "jsonb_path_ops"},
+        ),
     )
 
+    id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
+
     # Stable external identifier
     key: Mapped[str] = mapped_column(String(128), nullable=False, unique=True)
 
@@ -27,7 +48,10 @@ class Community(Base):
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Forward-compatible extension fields
-    extra: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    extra: Mapped[dict] = mapped_column(JSONType, nullable=False, default=dict)
+
+    # Bumped by every import of this community; exposed as ETag on community-scoped reads
+    revision: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
 
     # Community-scoped dependents: replacement import deletes these by deleting Community
     participants: Mapped[list["Participant"]] = relationship(
@@ -62,14 +86,31 @@ class Participant(Base):
     __table_args__ = (
         UniqueConstraint("community_id", "key", name="uq_participant_community_key"),
         Index("ix_participant_community_id", "community_id"),
+        Index("ix_participant_iri", "iri", postgresql_using="hash"),
+        Index(
+            "ix_participant_extra",
+            "extra",
+            postgresql_using="gin",
+            postgresql_ops={"extra": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_participant_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_participant_key_trgm",
+            "key",
+            postgresql_using="gin",
+            postgresql_ops={"key": "gin_trgm_ops"},
+        ),
     )
 
-    id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
-    )
+    id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
 
     community_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        UUID,
         ForeignKey("community.id", ondelete="CASCADE"),
         nullable=False,
     )
@@ -84,7 +125,7 @@ class Participant(Base):
     # Optional expanded IRI for auth identity (e.g., Keycloak subject IRI)
     auth_iri: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    extra: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    extra: Mapped[dict] = mapped_column(JSONType, nullable=False, default=dict)
 
     community: Mapped["Community"] = relationship(back_populates="participants")
 
@@ -103,20 +144,25 @@ class Membership(Base):
             "community_id", "participant_id", name="uq_membership_community_participant"
         ),
         Index("ix_membership_community_id", "community_id"),
+        Index("ix_membership_iri", "iri", postgresql_using="hash"),
+        Index(
+            "ix_membership_extra",
+            "extra",
+            postgresql_using="gin",
+            postgresql_ops={"extra": "jsonb_path_ops"},
+        ),
         Index("ix_membership_participant_id", "participant_id"),
     )
 
-    id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
-    )
+    id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
 
     community_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        UUID,
         ForeignKey("community.id", ondelete="CASCADE"),
         nullable=False,
     )
     participant_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        UUID,
         ForeignKey("participant.id", ondelete="CASCADE"),
         nullable=False,
     )
@@ -132,7 +178,7 @@ class Membership(Base):
     valid_from: Mapped[str | None] = mapped_column(String(64), nullable=True)
     valid_to: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
-    extra: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    extra: Mapped[dict] = mapped_column(JSONType, nullable=False, default=dict)
 
     community: Mapped["Community"] = relationship(back_populates="memberships")
     participant: Mapped["Participant"] = relationship(back_populates="memberships")
@@ -143,14 +189,37 @@ class Site(Base):
     __table_args__ = (
         UniqueConstraint("community_id", "key", name="uq_site_community_key"),
         Index("ix_site_community_id", "community_id"),
+        Index("ix_site_iri", "iri", postgresql_using="hash"),
+        Index(
+            "ix_site_extra",
+            "extra",
+            postgresql_using="gin",
+            postgresql_ops={"extra": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_site_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_site_area_trgm",
+            "area",
+            postgresql_using="gin",
+            postgresql_ops={"area": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_site_key_trgm",
+            "key",
+            postgresql_using="gin",
+            postgresql_ops={"key": "gin_trgm_ops"},
+        ),
     )
 
-    id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
-    )
+    id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
 
     community_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        UUID,
         ForeignKey("community.id", ondelete="CASCADE"),
         nullable=False,
     )
@@ -163,7 +232,7 @@ class Site(Base):
     # Keep as a simple string; can be normalized later (geo areas, municipalities, etc.)
     area: Mapped[str | None] = mapped_column(String(256), nullable=True)
 
-    extra: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    extra: Mapped[dict] = mapped_column(JSONType, nullable=False, default=dict)
 
     community: Mapped["Community"] = relationship(back_populates="sites")
 
@@ -173,28 +242,33 @@ class Asset(Base):
     __table_args__ = (
         UniqueConstraint("community_id", "key", name="uq_asset_community_key"),
         Index("ix_asset_community_id", "community_id"),
+        Index("ix_asset_iri", "iri", postgresql_using="hash"),
+        Index(
+            "ix_asset_extra",
+            "extra",
+            postgresql_using="gin",
+            postgresql_ops={"extra": "jsonb_path_ops"},
+        ),
         Index("ix_asset_owner_participant_id", "owner_participant_id"),
         Index("ix_asset_site_id", "site_id"),
     )
 
-    id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
-    )
+    id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
 
     community_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        UUID,
         ForeignKey("community.id", ondelete="CASCADE"),
         nullable=False,
     )
 
     owner_participant_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        UUID,
         ForeignKey("participant.id", ondelete="CASCADE"),
         nullable=False,
     )
 
     site_id: Mapped[uuid.UUID | None] = mapped_column(
-        UUID(as_uuid=True),
+        UUID,
         ForeignKey("site.id", ondelete="SET NULL"),
         nullable=True,
     )
@@ -207,7 +281,7 @@ class Asset(Base):
 
     name: Mapped[str | None] = mapped_column(String(256), nullable=True)
 
-    extra: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    extra: Mapped[dict] = mapped_column(JSONType, nullable=False, default=dict)
 
     community: Mapped["Community"] = relationship(back_populates="assets")
 
@@ -217,29 +291,53 @@ class Meter(Base):
     __table_args__ = (
         UniqueConstraint("community_id", "key", name="uq_meter_community_key"),
         Index("ix_meter_community_id", "community_id"),
+        Index("ix_meter_iri", "iri", postgresql_using="hash"),
+        Index(
+            "ix_meter_extra",
+            "extra",
+            postgresql_using="gin",
+            postgresql_ops={"extra": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_meter_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_meter_key_trgm",
+            "key",
+            postgresql_using="gin",
+            postgresql_ops={"key": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_meter_pod_trgm",
+            "pod",
+            postgresql_using="gin",
+            postgresql_ops={"pod": "gin_trgm_ops"},
+        ),
         Index("ix_meter_owner_participant_id", "owner_participant_id"),
         Index("ix_meter_site_id", "site_id"),
         Index("ix_meter_sensor_id", "sensor_id"),
+        Index("ix_meter_pod", "pod"),
     )
 
-    id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
-    )
+    id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
 
     community_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        UUID,
         ForeignKey("community.id", ondelete="CASCADE"),
         nullable=False,
     )
 
     owner_participant_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True),
+        UUID,
         ForeignKey("participant.id", ondelete="CASCADE"),
         nullable=False,
     )
 
     site_id: Mapped[uuid.UUID | None] = mapped_column(
-        UUID(as_uuid=True),
+        UUID,
         ForeignKey("site.id", ondelete="SET NULL"),
         nullable=True,
     )
@@ -255,6 +353,6 @@ class Meter(Base):
 
     name: Mapped[str | None] = mapped_column(String(256), nullable=True)
 
-    extra: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    extra: Mapped[dict] = mapped_column(JSONType, nullable=False, default=dict)
 
     community: Mapped["Community"] = relationship(back_populates="meters")
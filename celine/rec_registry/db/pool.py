@@ -0,0 +1,87 @@
+"""
+Connection pool telemetry.
+
+Each engine gets its own ``AsyncAdaptedQueuePool`` subclass bound to a
+``PoolStats`` so checkout wait time (queueing, connecting and pre-ping included),
+overflow use and timeouts can be read back next to the live in-use/idle counts.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    # Connections opened beyond pool_size
+    overflow_events: int = 0
+    timeouts: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+
+def instrumented_pool(stats: PoolStats) -> type[AsyncAdaptedQueuePool]:
+    """
+    Pool class recording every checkout into ``stats`` (kept across ``recreate``).
+    """
+
+    class InstrumentedPool(AsyncAdaptedQueuePool):
+        pool_stats = stats
+
+        def connect(self):
+            t0 = time.perf_counter()
+            try:
+                conn = super().connect()
+            except exc.TimeoutError:
+                self.pool_stats.timeouts += 1
+                raise
+            self.pool_stats.record(time.perf_counter() - t0)
+            return conn
+
+        def _inc_overflow(self) -> bool:
+            # Called for every new connection; beyond pool_size once overflow() > 0
+            opened = super()._inc_overflow()
+            if opened and self.overflow() > 0:
+                self.pool_stats.overflow_events += 1
+            return opened
+
+    return InstrumentedPool
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    """
+    Live pool counts plus the recorded checkout statistics.
+    """
+    stats: PoolStats | None = getattr(pool, "pool_stats", None)
+    status: dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            in_use=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            timeout=pool.timeout(),
+        )
+    if stats is not None:
+        status.update(
+            checkouts=stats.checkouts,
+            overflow_events=stats.overflow_events,
+            timeouts=stats.timeouts,
+            wait_total_s=stats.wait_total,
+            wait_mean_ms=(
+                stats.wait_total / stats.checkouts * 1000 if stats.checkouts else None
+            ),
+            wait_max_ms=stats.wait_max * 1000,
+        )
+    return status
@@ -1,16 +1,140 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import itertools
+import uuid
+
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from celine.rec_registry.core.settings import settings
+from celine.rec_registry.db.pool import instrumented_pool, PoolStats
+
+PRIMARY = "primary"
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_async_engine(settings.database_url, future=True, pool_pre_ping=True)
-SessionLocal = async_sessionmaker(
-    bind=engine, expire_on_commit=False, class_=AsyncSession
-)
+# Checkout statistics per database name, see db/pool.py
+POOL_STATS: dict[str, PoolStats] = {}
+
+
+def _sqlite_engine(url: str) -> AsyncEngine:
+    kwargs = {}
+    sqlite_url = make_url(url)
+    if sqlite_url.database in (None, "", ":memory:"):
+        # A private in-memory database would be one connection shared by every
+        # session (and nested sessions, e.g. streams, would begin inside the
+        # outer transaction): name it and share its cache so each session gets
+        # its own connection. It lives as long as the pool keeps one open.
+        sqlite_url = sqlite_url.set(
+            database=f"file:celine-{uuid.uuid4().hex}",
+            query={"mode": "memory", "cache": "shared", "uri": "true"},
+        )
+    if sqlite_url.query.get("mode") == "memory":
+        kwargs["poolclass"] = AsyncAdaptedQueuePool
+    engine = create_async_engine(sqlite_url, future=True, **kwargs)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _connect(dbapi_connection, _record):
+        # Foreign keys carry the ON DELETE CASCADE replacement imports rely on; the
+        # driver's own transaction handling is disabled so that "begin" below opens
+        # every transaction, reads included (one snapshot per transaction)
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+def _engine(url: str, db: str):
+    if url.startswith("sqlite"):
+        return _sqlite_engine(url)
+    kwargs = {}
+    if url.startswith("postgresql+asyncpg://"):
+        kwargs["connect_args"] = {
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size
+        }
+    return create_async_engine(
+        url,
+        future=True,
+        poolclass=instrumented_pool(POOL_STATS.setdefault(db, PoolStats())),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        **kwargs,
+    )
+
+
+def _sessionmaker(bind, db: str) -> async_sessionmaker:
+    # session.info["db"] names the database a session reads from
+    return async_sessionmaker(
+        bind=bind, expire_on_commit=False, class_=AsyncSession, info={"db": db}
+    )
+
+
+engine = _engine(settings.database_url, PRIMARY)
+SessionLocal = _sessionmaker(engine, PRIMARY)
+
+# Dialect of every engine here ("postgresql" or "sqlite"), for the few queries
+# written differently per database
+DIALECT = engine.dialect.name
+
+# Optional read replicas, each with its own engine and pool
+ENGINES = {PRIMARY: engine}
+SESSIONMAKERS = {PRIMARY: SessionLocal}
+_read_urls = [u.strip() for u in settings.read_database_urls.split(",") if u.strip()]
+for i, url in enumerate(_read_urls):
+    ENGINES[f"replica{i}"] = _engine(url, f"replica{i}")
+    SESSIONMAKERS[f"replica{i}"] = _sessionmaker(ENGINES[f"replica{i}"], f"replica{i}")
+ReadSessionLocals = [m for db, m in SESSIONMAKERS.items() if db != PRIMARY]
+_replicas = itertools.cycle(ReadSessionLocals)
+
+
+def read_sessionmaker() -> async_sessionmaker:
+    """
+    Next read replica (round robin), or the primary when none is configured.
+    """
+    return next(_replicas) if ReadSessionLocals else SessionLocal
+
+
+def sessionmaker_for(session: AsyncSession) -> async_sessionmaker:
+    """
+    Sessionmaker for the database ``session`` reads from (for sessions that
+    outlive the request, e.g. streams).
+    """
+    return SESSIONMAKERS[session.info.get("db", PRIMARY)]
+
+
+async def begin_snapshot(session: AsyncSession) -> None:
+    """
+    Begin ``session``'s transaction on one consistent snapshot for multi-query
+    reads: REPEATABLE READ on Postgres; SQLite transactions already are.
+    """
+    options = {"isolation_level": "REPEATABLE READ"} if DIALECT == "postgresql" else {}
+    await session.connection(execution_options=options)
+
+
+async def create_schema() -> None:
+    """
+    Create missing tables and indexes from the models (SQLite databases: the
+    Alembic migrations are Postgres-only).
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
 
 
 async def get_session():
@@ -0,0 +1,137 @@
+"""
+Per-request SQL statement statistics.
+
+Engine cursor events time every statement and add it to the ``RequestStats`` of
+the current request (a context variable set by the request middleware, also
+visible inside streamed response bodies). On top of that:
+
+- statements slower than ``settings.slow_query_ms`` are logged;
+- with ``settings.sql_repeat_limit`` set (dev/test), a request running the same
+  statement more than that many times fails with ``RepeatedStatementError``,
+  which is how N+1 query patterns show up in tests.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from celine.rec_registry.core.settings import settings
+
+log = logging.getLogger(__name__)
+
+# Longest statement text kept in logs and errors
+_MAX_STATEMENT = 500
+
+
+class RepeatedStatementError(RuntimeError):
+    """
+    One request ran the same statement more than ``settings.sql_repeat_limit``
+    times (likely an N+1 query pattern).
+    """
+
+
+class RequestStats:
+    __slots__ = ("statements", "seconds", "slowest", "slowest_statement", "shapes")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.seconds = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: str | None = None
+        # Executions per statement text, only kept when repeats are checked
+        self.shapes: dict[str, int] | None = (
+            {} if settings.sql_repeat_limit > 0 else None
+        )
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.seconds += seconds
+        if seconds > self.slowest:
+            self.slowest = seconds
+            self.slowest_statement = statement
+        if self.shapes is not None:
+            n = self.shapes[statement] = self.shapes.get(statement, 0) + 1
+            if n > settings.sql_repeat_limit:
+                raise RepeatedStatementError(
+                    f"Statement executed {n} times in one request "
+                    f"(SQL_REPEAT_LIMIT={settings.sql_repeat_limit}): "
+                    f"{_shorten(statement)}"
+                )
+
+    def server_timing(self) -> str:
+        """
+        ``Server-Timing`` header value (durations in milliseconds).
+        """
+        return (
+            f'db;desc="{self.statements} statements";dur={self.seconds * 1000:.2f}, '
+            f"db-slowest;dur={self.slowest * 1000:.2f}"
+        )
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    return _current.get()
+
+
+@contextmanager
+def request_stats() -> Iterator[RequestStats]:
+    """
+    Collect the statements of the enclosed request; nested uses share the
+    outermost ``RequestStats``.
+    """
+    stats = _current.get()
+    if stats is not None:
+        yield stats
+        return
+    stats = RequestStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _shorten(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > _MAX_STATEMENT:
+        return statement[:_MAX_STATEMENT] + "..."
+    return statement
+
+
+def instrument_engine(
+    engine: AsyncEngine, db: str, observe: Callable[[float], None] | None = None
+) -> None:
+    """
+    Time every statement run on ``engine`` into the current request's stats,
+    the slow-query log and ``observe`` (e.g. a latency histogram).
+    """
+    slow = settings.slow_query_ms / 1000
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._stats_t0 = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._stats_t0
+        if observe is not None:
+            observe(elapsed)
+        if slow and elapsed >= slow:
+            log.warning(
+                "Slow statement on %s (%.1f ms): %s",
+                db,
+                elapsed * 1000,
+                _shorten(statement),
+            )
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
@@ -1,12 +1,73 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from celine.rec_registry.core.middleware import PolicyMiddleware
+from celine.rec_registry.core.compression import CompressionMiddleware
+from celine.rec_registry.core.metrics import MetricsMiddleware, watch_engine
+from celine.rec_registry.core.middleware import (
+    PolicyMiddleware,
+    StatementStatsMiddleware,
+)
+from celine.rec_registry.core.policy import AccessPolicy, CachedAccessPolicy
+from celine.rec_registry.core.settings import DEFAULT_CURSOR_SECRET, settings
 from celine.rec_registry.api.admin import router as admin_router
 from celine.rec_registry.api.meta import router as meta
 from celine.rec_registry.api.communities import router as communities_router
+from celine.rec_registry.api.resolve import router as resolve_router
+from celine.rec_registry.api.search import router as search_router
+from celine.rec_registry.db.session import create_schema, DIALECT, ENGINES
+from celine.rec_registry.db.statements import instrument_engine
+from celine.rec_registry.services.community_cache import invalidation_bus
+
+log = logging.getLogger(__name__)
+
+
+def check_settings() -> None:
+    """
+    Warn about settings that are only fit for development.
+    """
+    if settings.cursor_secret == DEFAULT_CURSOR_SECRET:
+        log.warning(
+            "CURSOR_SECRET is not set: pagination cursors are signed with a public "
+            "default key and can be forged. Set a private value, shared by every "
+            "worker behind the same load balancer."
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_settings()
+    if DIALECT == "sqlite":
+        await create_schema()
+    await invalidation_bus.start()
+    try:
+        yield
+    finally:
+        await invalidation_bus.stop()
+        # Close pooled connections (aiosqlite's connection threads would keep
+        # the process alive)
+        for engine in ENGINES.values():
+            await engine.dispose()
+
+
+policy = AccessPolicy()
+if settings.policy_cache_size > 0:
+    policy = CachedAccessPolicy(policy)
+
+app = FastAPI(title="CELINE Registry API", version="0.1.0", lifespan=lifespan)
+app.add_middleware(PolicyMiddleware, policy=policy)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(StatementStatsMiddleware)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
 
-app = FastAPI(title="CELINE Registry API", version="0.1.0")
-app.add_middleware(PolicyMiddleware)
+for db, engine in ENGINES.items():
+    instrument_engine(
+        engine, db, watch_engine(engine, db) if settings.metrics_enabled else None
+    )
 
 app.include_router(meta)
 app.include_router(admin_router)
 app.include_router(communities_router)
+app.include_router(resolve_router)
+app.include_router(search_router)
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Literal
 from pydantic import BaseModel, Field
 from celine.rec_registry.schemas.bundle import RegistryBundleIn
 
@@ -10,21 +10,35 @@ class ImportRequest(BaseModel):
 
     bundle: RegistryBundleIn = Field(..., description="Greenland bundle as JSON object")
     dry_run: bool = Field(default=False, description="Validate without writing to DB")
+    mode: Literal["replace", "incremental"] = Field(
+        default="replace",
+        description=(
+            "replace: delete and recreate the community graph; incremental: update "
+            "changed rows, insert new ones and delete missing ones (matched by key)"
+        ),
+    )
 
 
 class ImportReport(BaseModel):
     """
-    Result of a replacement import operation.
+    Result of an import operation.
     Returned by /admin/import and used by CLI.
     """
 
     community_key: str
 
+    # Community revision after the import (None for dry runs)
+    revision: int | None = None
+
     # Counts of deleted entities (previous state)
     deleted: Dict[str, int] = Field(default_factory=dict)
 
     # Counts of inserted entities (new state)
     inserted: Dict[str, int] = Field(default_factory=dict)
 
+    # Incremental imports only: counts of rows updated in place / left untouched
+    updated: Dict[str, int] = Field(default_factory=dict)
+    unchanged: Dict[str, int] = Field(default_factory=dict)
+
     # Non-fatal issues (skipped placeholders, missing refs, etc.)
     warnings: List[str] = Field(default_factory=list)
@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field, model_validator
+
+from celine.rec_registry.core.settings import settings
+
+# Identifiers per batch request; longer lists are rejected (422) while parsing
+MAX_ITEMS = settings.resolve_max_items
+
+
+class MeterResolveRequest(BaseModel):
+    """
+    Batch lookup of meters by external identifiers, across all communities.
+    """
+
+    sensor_ids: list[str] = Field(
+        default_factory=list,
+        max_length=MAX_ITEMS,
+        description="Meter sensor_id values",
+    )
+    pods: list[str] = Field(
+        default_factory=list, max_length=MAX_ITEMS, description="Italian POD codes"
+    )
+
+    @model_validator(mode="after")
+    def _check_total(self) -> "MeterResolveRequest":
+        if len(self.sensor_ids) + len(self.pods) > MAX_ITEMS:
+            raise ValueError(f"At most {MAX_ITEMS} identifiers per request")
+        return self
+
+
+class IriResolveRequest(BaseModel):
+    """
+    Batch dereference of entity IRIs.
+    """
+
+    iris: list[str] = Field(
+        default_factory=list, max_length=MAX_ITEMS, description="Absolute entity IRIs"
+    )
@@ -0,0 +1,243 @@
+"""
+In-process cache of community key -> (id, iri, revision).
+
+Every community-scoped read first needs the community row id. Resolving it from a
+bounded LRU saves one round trip per request; entries are dropped when an import
+replaces the community. Invalidations are fanned out to every worker through an
+``InvalidationBus`` (Postgres LISTEN/NOTIFY by default, in-process otherwise) and
+entries also expire after a TTL as a safety net for missed notifications.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from celine.rec_registry.core.settings import settings
+from celine.rec_registry.db.models import Community
+from celine.rec_registry.db.session import PRIMARY
+
+log = logging.getLogger(__name__)
+
+CHANNEL = "rec_registry_community"
+
+
+@dataclass(frozen=True)
+class CommunityRef:
+    id: uuid.UUID
+    key: str
+    iri: str
+    revision: int
+
+
+class CommunityCache:
+    """
+    Bounded LRU of ``CommunityRef`` by (database, community key) with a per-entry TTL.
+
+    Entries are scoped by the database they were read from (``session.info["db"]``)
+    so a lagging read replica never serves a revision the primary already replaced.
+
+    Every invalidation bumps a generation: a lookup records it before its SELECT
+    and passes it to ``put``, which drops the result if an invalidation ran in
+    between (the row may predate the import that triggered it).
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], tuple[float, CommunityRef]] = (
+            OrderedDict()
+        )
+        self._scopes: set[str] = set()
+        # Invalidations per key, and of the whole cache (clear)
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+
+    def generation(self, key: str) -> tuple[int, int]:
+        return self._epoch, self._generations.get(key, 0)
+
+    def get(self, key: str, scope: str = PRIMARY) -> CommunityRef | None:
+        entry = self._entries.get((scope, key))
+        if entry is None:
+            return None
+        expires, ref = entry
+        if expires < time.monotonic():
+            del self._entries[(scope, key)]
+            return None
+        self._entries.move_to_end((scope, key))
+        return ref
+
+    def put(
+        self,
+        ref: CommunityRef,
+        scope: str = PRIMARY,
+        ttl: float | None = None,
+        generation: tuple[int, int] | None = None,
+    ) -> None:
+        if self.max_entries <= 0:
+            return
+        if generation is not None and generation != self.generation(ref.key):
+            return
+        self._scopes.add(scope)
+        entry_key = (scope, ref.key)
+        self._entries[entry_key] = (
+            time.monotonic() + (self.ttl if ttl is None else ttl),
+            ref,
+        )
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        self._generations[key] = self._generations.get(key, 0) + 1
+        for scope in self._scopes:
+            self._entries.pop((scope, key), None)
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._generations.clear()
+        self._entries.clear()
+
+
+class InvalidationBus:
+    """
+    Fan-out of "community changed" events to every worker.
+
+    The base implementation is in-process only: it invalidates the local cache
+    once the publishing transaction commits.
+    """
+
+    def __init__(self, cache: CommunityCache):
+        self.cache = cache
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, session: AsyncSession, key: str) -> None:
+        event.listen(
+            session.sync_session,
+            "after_commit",
+            lambda _session: self.cache.invalidate(key),
+            once=True,
+        )
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """
+    Postgres LISTEN/NOTIFY bus.
+
+    ``publish`` issues ``pg_notify`` inside the import transaction, so the
+    notification is delivered to all listeners (this worker included) only on
+    commit. Each worker keeps one dedicated asyncpg connection listening on
+    ``CHANNEL``; if it drops, the cache is cleared and the listener reconnects.
+    """
+
+    def __init__(self, cache: CommunityCache, dsn: str):
+        super().__init__(cache)
+        self.dsn = dsn
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def publish(self, session: AsyncSession, key: str) -> None:
+        await session.execute(
+            text("SELECT pg_notify(:channel, :key)"), {"channel": CHANNEL, "key": key}
+        )
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        self.cache.invalidate(payload)
+
+    async def _listen_forever(self) -> None:
+        import asyncpg
+
+        while True:
+            lost = asyncio.Event()
+            try:
+                conn = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError) as exc:
+                log.warning("community cache listener: connect failed: %s", exc)
+                await asyncio.sleep(5)
+                continue
+            try:
+                conn.add_termination_listener(lambda _conn: lost.set())
+                await conn.add_listener(CHANNEL, self._on_notify)
+                # Anything published while we were not listening is unknown
+                self.cache.clear()
+                await lost.wait()
+                log.warning("community cache listener: connection lost")
+            finally:
+                if not conn.is_closed():
+                    await conn.close()
+
+
+community_cache = CommunityCache(
+    max_entries=settings.community_cache_size,
+    ttl=settings.community_cache_ttl,
+)
+
+
+def _build_bus() -> InvalidationBus:
+    url = settings.database_url
+    if settings.community_cache_bus == "postgres" and url.startswith(
+        "postgresql+asyncpg://"
+    ):
+        dsn = url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        return PostgresInvalidationBus(community_cache, dsn)
+    return InvalidationBus(community_cache)
+
+
+invalidation_bus = _build_bus()
+
+
+async def resolve_community(session: AsyncSession, key: str) -> CommunityRef | None:
+    """
+    Resolve a community key, hitting the database only on a cache miss.
+
+    Lookups are cached per database ``session`` reads from.
+    """
+    scope = session.info.get("db", PRIMARY)
+    ref = community_cache.get(key, scope)
+    if ref is not None:
+        return ref
+    generation = community_cache.generation(key)
+    row = (
+        await session.execute(
+            select(
+                Community.id, Community.key, Community.iri, Community.revision
+            ).where(Community.key == key)
+        )
+    ).first()
+    if row is None:
+        return None
+    ref = CommunityRef(id=row.id, key=row.key, iri=row.iri, revision=row.revision)
+    ttl = None if scope == PRIMARY else settings.community_cache_replica_ttl
+    community_cache.put(ref, scope, ttl, generation)
+    return ref
+
+
+async def community_changed(session: AsyncSession, key: str) -> None:
+    """
+    Invalidate ``key`` in every worker once the current transaction commits.
+    """
+    community_cache.invalidate(key)
+    await invalidation_bus.publish(session, key)
@@ -0,0 +1,105 @@
+"""
+Whole-community graph snapshot.
+
+All collections are read in one snapshot transaction (REPEATABLE READ on
+Postgres) so the result is consistent even if an import commits halfway through. References between
+entities are emitted as integer indexes into the referenced collection instead
+of repeated IRIs.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from celine.rec_registry.db.models import Community
+from celine.rec_registry.db.session import begin_snapshot, SessionLocal
+from celine.rec_registry.services.community_cache import CommunityRef
+from celine.rec_registry.services.queries import FIELDS, MODELS
+
+# Reference fields: response field -> (foreign key column, referenced collection)
+REFS: dict[str, dict[str, tuple[str, str]]] = {
+    "memberships": {"participant": ("participant_id", "participants")},
+    "assets": {
+        "owner": ("owner_participant_id", "participants"),
+        "site": ("site_id", "sites"),
+    },
+    "meters": {
+        "owner": ("owner_participant_id", "participants"),
+        "site": ("site_id", "sites"),
+    },
+}
+
+# Collections in dependency order: referenced collections come first
+COLLECTIONS = ["participants", "memberships", "sites", "assets", "meters"]
+
+
+def _graph_query(entity: str, community_id, include_extra: bool):
+    model = MODELS[entity]
+    refs = REFS.get(entity, {})
+    cols = [model.id.label("_pk")]
+    for name, col in FIELDS[entity].items():
+        if name == "extra" and not include_extra:
+            continue
+        if name in refs:
+            cols.append(getattr(model, refs[name][0]).label(name))
+        else:
+            cols.append(col)
+    return select(*cols).where(model.community_id == community_id).order_by(model.key)
+
+
+async def community_graph(
+    community_key: str,
+    *,
+    include_extra: bool = True,
+    sessionmaker: async_sessionmaker = SessionLocal,
+) -> tuple[CommunityRef, dict[str, Any]] | None:
+    """
+    Snapshot a community and all its collections.
+
+    Returns the ``CommunityRef`` of the snapshot (its revision may be newer than a
+    cached one) with the payload, or None if the community does not exist.
+    """
+    async with sessionmaker() as session:
+        await begin_snapshot(session)
+        community_cols = [Community.id, Community.revision]
+        community_cols += [
+            col
+            for name, col in FIELDS["communities"].items()
+            if include_extra or name != "extra"
+        ]
+        row = (
+            await session.execute(
+                select(*community_cols).where(Community.key == community_key)
+            )
+        ).first()
+        if row is None:
+            return None
+        community = dict(row._mapping)
+        ref = CommunityRef(
+            id=community.pop("id"),
+            key=row.key,
+            iri=row.iri,
+            revision=community.pop("revision"),
+        )
+
+        payload: dict[str, Any] = {"community": community}
+        index: dict[str, dict[Any, int]] = {}
+        for entity in COLLECTIONS:
+            rows = (
+                await session.execute(_graph_query(entity, ref.id, include_extra))
+            ).mappings()
+            refs = REFS.get(entity, {})
+            items = []
+            pks: dict[Any, int] = {}
+            for i, r in enumerate(rows):
+                item = dict(r)
+                pks[item.pop("_pk")] = i
+                for name, (_, target) in refs.items():
+                    item[name] = index[target].get(item[name])
+                items.append(item)
+            index[entity] = pks
+            payload[entity] = items
+    return ref, payload
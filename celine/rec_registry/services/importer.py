@@ -1,10 +1,22 @@
-from typing import Any
+import re
+import uuid
+from typing import Any, Callable
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import (
+    UniqueConstraint,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    union_all,
+    update,
+)
 
 from celine.rec_registry.schemas.bundle import RegistryBundleIn
 from celine.rec_registry.schemas.iri import expand_iri, api_iri
+from celine.rec_registry.services.community_cache import community_changed
 from celine.rec_registry.db.models import (
     Community,
     Participant,
@@ -14,131 +26,164 @@ from celine.rec_registry.db.models import (
     Meter,
 )
 
+# Entity names used as ImportReport count keys
+ENTITY_KEYS = ["community", "participant", "membership", "site", "asset", "meter"]
+
+# Dependents of a community, keyed like ENTITY_KEYS
+DEPENDENTS = {
+    "participant": Participant,
+    "membership": Membership,
+    "site": Site,
+    "asset": Asset,
+    "meter": Meter,
+}
+
+
+# Ids per DELETE ... WHERE id IN (...) (one bind parameter each)
+DELETE_BATCH = 5000
+
+# Keys appended to a collection IRI unchanged: no path, query, fragment or scheme syntax
+_PLAIN_KEY = re.compile(r"[A-Za-z0-9_~-][A-Za-z0-9._~-]*")
+
+
+def _member_iris(
+    base_url: str, community_key: str, collection: str
+) -> Callable[[str], str]:
+    """
+    ``api_iri`` for the members of one collection, joining the collection IRI
+    once instead of once per row.
+    """
+    path = f"communities/{community_key}/{collection}/"
+    prefix = api_iri(base_url, path)
+
+    def iri(key: str) -> str:
+        if _PLAIN_KEY.fullmatch(key):
+            return prefix + key
+        return api_iri(base_url, path + key)
+
+    return iri
+
 
 def _extra(d: dict[str, Any], known: set[str]) -> dict[str, Any]:
     return {k: v for k, v in (d or {}).items() if k not in known and v is not None}
 
 
-async def replacement_import_bundle(
-    session: AsyncSession,
+async def _counts(session: AsyncSession, community_id: uuid.UUID) -> dict[str, int]:
+    """
+    Row counts of every dependent of a community, in one round trip.
+    """
+    q = union_all(
+        *(
+            select(literal(name).label("entity"), func.count().label("count"))
+            .select_from(model)
+            .where(model.community_id == community_id)
+            for name, model in DEPENDENTS.items()
+        )
+    )
+    return {r.entity: r.count for r in (await session.execute(q)).all()}
+
+
+async def _insert(session: AsyncSession, model, rows: list[dict[str, Any]]) -> None:
+    # executemany: batched into multi-row INSERTs by the driver / insertmanyvalues
+    if rows:
+        await session.execute(insert(model.__table__), rows)
+
+
+def _community_row(
+    bundle: RegistryBundleIn, base_url: str, community_id: uuid.UUID
+) -> dict[str, Any]:
+    ctx = bundle.context
+    community_key = bundle.community.key
+    c_known = {"key", "iri", "name", "description"}
+    return {
+        "id": community_id,
+        "key": community_key,
+        "iri": expand_iri(
+            bundle.community.iri or api_iri(base_url, f"communities/{community_key}"),
+            base=ctx.base if ctx else None,
+            prefixes=ctx.prefixes if ctx else {},
+        ),
+        "name": bundle.community.name,
+        "description": bundle.community.description,
+        "extra": _extra(bundle.community.model_dump(), c_known),
+    }
+
+
+def _bundle_rows(
     bundle: RegistryBundleIn,
     *,
     base_url: str,
-    dry_run: bool = False,
-) -> tuple[str, dict[str, int], dict[str, int], list[str]]:
-    warnings: list[str] = []
+    community_id: uuid.UUID,
+    ids: dict[str, dict[str, uuid.UUID]],
+    warnings: list[str],
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Rows of every dependent of the bundle's community, keyed like ``DEPENDENTS``.
+
+    ``ids`` maps entity -> key -> id of stored rows to keep; other rows get a new
+    client-side uuid4. Entries that cannot be imported are reported in
+    ``warnings`` and left out.
+    """
     ctx = bundle.context
     base = ctx.base if ctx else None
     prefixes = ctx.prefixes if ctx else {}
-
     community_key = bundle.community.key
-    community_iri = expand_iri(
-        bundle.community.iri or api_iri(base_url, f"communities/{community_key}"),
-        base=base,
-        prefixes=prefixes,
-    )
 
-    deleted = {
-        k: 0
-        for k in ["community", "participant", "membership", "site", "asset", "meter"]
-    }
-    existing = await session.scalar(
-        select(Community)
-        .options(
-            selectinload(Community.participants),
-            selectinload(Community.memberships),
-            selectinload(Community.sites),
-            selectinload(Community.assets),
-            selectinload(Community.meters),
-        )
-        .where(Community.key == community_key)
-    )
-
-    if existing is not None:
-        deleted["community"] = 1
-        deleted["participant"] = len(existing.participants)
-        deleted["membership"] = len(existing.memberships)
-        deleted["site"] = len(existing.sites)
-        deleted["asset"] = len(existing.assets)
-        deleted["meter"] = len(existing.meters)
-        if not dry_run:
-            await session.delete(existing)
-            await session.flush()
-
-    inserted = {
-        k: 0
-        for k in ["community", "participant", "membership", "site", "asset", "meter"]
-    }
-
-    if dry_run:
-        inserted["community"] = 1
-        inserted["participant"] = len(bundle.participants)
-        inserted["membership"] = len(bundle.memberships)
-        inserted["site"] = len(bundle.sites)
-        inserted["asset"] = len(bundle.assets)
-        inserted["meter"] = sum(
-            1 for m in bundle.meters if m.sensor_id
-        )  # skip placeholders
-        return community_key, deleted, inserted, warnings
+    def row_id(entity: str, key: str) -> uuid.UUID:
+        return ids.get(entity, {}).get(key) or uuid.uuid4()
 
-    c_known = {"key", "iri", "name", "description"}
-    community = Community(
-        key=community_key,
-        iri=community_iri,
-        name=bundle.community.name,
-        description=bundle.community.description,
-        extra=_extra(bundle.community.model_dump(), c_known),
-    )
-    session.add(community)
-    await session.flush()
-    inserted["community"] = 1
+    participant_iri = _member_iris(base_url, community_key, "participants")
+    site_iri = _member_iris(base_url, community_key, "sites")
+    membership_iri = _member_iris(base_url, community_key, "memberships")
+    asset_iri = _member_iris(base_url, community_key, "assets")
+    meter_iri = _member_iris(base_url, community_key, "meters")
+    rows: dict[str, list[dict[str, Any]]] = {name: [] for name in DEPENDENTS}
 
-    participant_by_key: dict[str, Participant] = {}
+    participant_ids: dict[str, uuid.UUID] = {}
     p_known = {"key", "iri", "kind", "name", "auth_iri"}
     for p in bundle.participants:
         p_iri = expand_iri(
-            p.iri
-            or api_iri(base_url, f"communities/{community_key}/participants/{p.key}"),
+            p.iri or participant_iri(p.key),
             base=base,
             prefixes=prefixes,
         )
         auth_iri = (
             expand_iri(p.auth_iri, base=base, prefixes=prefixes) if p.auth_iri else None
         )
-        obj = Participant(
-            community_id=community.id,
-            key=p.key,
-            iri=p_iri,
-            kind=p.kind,
-            name=p.name,
-            auth_iri=auth_iri,
-            extra=_extra(p.model_dump(), p_known),
+        participant_ids[p.key] = pk = row_id("participant", p.key)
+        rows["participant"].append(
+            {
+                "id": pk,
+                "community_id": community_id,
+                "key": p.key,
+                "iri": p_iri,
+                "kind": p.kind,
+                "name": p.name,
+                "auth_iri": auth_iri,
+                "extra": _extra(p.model_dump(), p_known),
+            }
         )
-        session.add(obj)
-        participant_by_key[p.key] = obj
-    await session.flush()
-    inserted["participant"] = len(participant_by_key)
 
-    site_by_key: dict[str, Site] = {}
+    site_ids: dict[str, uuid.UUID] = {}
     s_known = {"key", "iri", "name", "area"}
     for s in bundle.sites:
         s_iri = expand_iri(
-            s.iri or api_iri(base_url, f"communities/{community_key}/sites/{s.key}"),
+            s.iri or site_iri(s.key),
             base=base,
             prefixes=prefixes,
         )
-        obj = Site(
-            community_id=community.id,
-            key=s.key,
-            iri=s_iri,
-            name=s.name,
-            area=s.area,
-            extra=_extra(s.model_dump(), s_known),
+        site_ids[s.key] = pk = row_id("site", s.key)
+        rows["site"].append(
+            {
+                "id": pk,
+                "community_id": community_id,
+                "key": s.key,
+                "iri": s_iri,
+                "name": s.name,
+                "area": s.area,
+                "extra": _extra(s.model_dump(), s_known),
+            }
         )
-        session.add(obj)
-        site_by_key[s.key] = obj
-    await session.flush()
-    inserted["site"] = len(site_by_key)
 
     m_known = {
         "key",
@@ -150,16 +195,15 @@ async def replacement_import_bundle(
         "valid_to",
     }
     for m in bundle.memberships:
-        owner = participant_by_key.get(m.participant)
-        if owner is None:
+        owner_id = participant_ids.get(m.participant)
+        if owner_id is None:
             warnings.append(
                 f"membership {m.key}: unknown participant {m.participant}; skipped"
             )
             continue
 
         m_iri = expand_iri(
-            m.iri
-            or api_iri(base_url, f"communities/{community_key}/memberships/{m.key}"),
+            m.iri or membership_iri(m.key),
             base=base,
             prefixes=prefixes,
         )
@@ -167,65 +211,55 @@ async def replacement_import_bundle(
         status_iri = (
             expand_iri(m.status, base=base, prefixes=prefixes) if m.status else None
         )
-        obj = Membership(
-            community_id=community.id,
-            participant_id=owner.id,
-            key=m.key,
-            iri=m_iri,
-            role_iri=role_iri,
-            status_iri=status_iri,
-            valid_from=m.valid_from,
-            valid_to=m.valid_to,
-            extra=_extra(m.model_dump(), m_known),
+        rows["membership"].append(
+            {
+                "id": row_id("membership", m.key),
+                "community_id": community_id,
+                "participant_id": owner_id,
+                "key": m.key,
+                "iri": m_iri,
+                "role_iri": role_iri,
+                "status_iri": status_iri,
+                "valid_from": m.valid_from,
+                "valid_to": m.valid_to,
+                "extra": _extra(m.model_dump(), m_known),
+            }
         )
-        session.add(obj)
-        inserted["membership"] += 1
-    await session.flush()
 
     a_known = {"key", "iri", "owner_participant_key", "site_key", "category", "name"}
     for a in bundle.assets:
         owner_key = a.owner.ref
-        owner = participant_by_key.get(owner_key)
-        if owner is None:
+        owner_id = participant_ids.get(owner_key)
+        if owner_id is None:
             warnings.append(f"asset {a.key}: unknown owner {owner_key}; skipped")
             continue
-        site = site_by_key.get(a.located_at) if a.located_at else None
         a_iri = expand_iri(
-            a.iri or api_iri(base_url, f"communities/{community_key}/assets/{a.key}"),
+            a.iri or asset_iri(a.key),
             base=base,
             prefixes=prefixes,
         )
         cat_iri = (
             expand_iri(a.category, base=base, prefixes=prefixes) if a.category else None
         )
-        obj = Asset(
-            community_id=community.id,
-            owner_participant_id=owner.id,
-            site_id=site.id if site else None,
-            key=a.key,
-            iri=a_iri,
-            category_iri=cat_iri,
-            name=a.name,
-            extra=_extra(a.model_dump(), a_known),
+        rows["asset"].append(
+            {
+                "id": row_id("asset", a.key),
+                "community_id": community_id,
+                "owner_participant_id": owner_id,
+                "site_id": site_ids.get(a.located_at) if a.located_at else None,
+                "key": a.key,
+                "iri": a_iri,
+                "category_iri": cat_iri,
+                "name": a.name,
+                "extra": _extra(a.model_dump(), a_known),
+            }
         )
-        session.add(obj)
-        inserted["asset"] += 1
-    await session.flush()
-
-    me_known = {
-        "key",
-        "iri",
-        "owner_participant_key",
-        "site_key",
-        "sensor_id",
-        "pod",
-        "name",
-    }
 
+    me_known = {"key", "iri", "owner", "located_at", "sensor_id", "pod", "name"}
     for me in bundle.meters:
         owner_key = me.owner.ref if me.owner else None
-        owner = participant_by_key.get(owner_key) if owner_key else None
-        if owner is None:
+        owner_id = participant_ids.get(owner_key) if owner_key else None
+        if owner_id is None:
             warnings.append(f"meter {me.key}: unknown owner {owner_key}; skipped")
             continue
 
@@ -235,32 +269,268 @@ async def replacement_import_bundle(
             continue
 
         site_key = getattr(me, "located_at", None)
-        site = site_by_key.get(site_key) if site_key else None
 
         me_iri = expand_iri(
-            me.iri or api_iri(base_url, f"communities/{community_key}/meters/{me.key}"),
+            me.iri or meter_iri(me.key),
             base=base,
             prefixes=prefixes,
         )
 
-        obj = Meter(
-            community_id=community.id,
-            owner_participant_id=owner.id,
-            site_id=site.id if site else None,
-            key=me.key,
-            iri=me_iri,
-            sensor_id=me.sensor_id,
-            pod=getattr(me, "pod", None),
-            name=getattr(me, "name", None),
-            # keep forward-compat metadata (datasets, etc.) in extra
-            extra=_extra(
-                me.model_dump(),
-                {"key", "iri", "owner", "located_at", "sensor_id", "pod", "name"},
-            ),
+        rows["meter"].append(
+            {
+                "id": row_id("meter", me.key),
+                "community_id": community_id,
+                "owner_participant_id": owner_id,
+                "site_id": site_ids.get(site_key) if site_key else None,
+                "key": me.key,
+                "iri": me_iri,
+                "sensor_id": me.sensor_id,
+                "pod": getattr(me, "pod", None),
+                "name": getattr(me, "name", None),
+                # keep forward-compat metadata (datasets, etc.) in extra
+                "extra": _extra(me.model_dump(), me_known),
+            }
         )
-        session.add(obj)
-        inserted["meter"] += 1
 
-    await session.flush()
+    return rows
+
+
+async def replacement_import_bundle(
+    session: AsyncSession,
+    bundle: RegistryBundleIn,
+    *,
+    base_url: str,
+    dry_run: bool = False,
+) -> tuple[str, dict[str, int], dict[str, int], list[str], int | None]:
+    warnings: list[str] = []
+    community_key = bundle.community.key
+
+    deleted = {k: 0 for k in ENTITY_KEYS}
+    existing = (
+        await session.execute(
+            select(Community.id, Community.revision).where(
+                Community.key == community_key
+            )
+        )
+    ).first()
+
+    revision = 1
+    if existing is not None:
+        revision = existing.revision + 1
+        deleted["community"] = 1
+        deleted.update(await _counts(session, existing.id))
+        if not dry_run:
+            # Dependents go with the community (ON DELETE CASCADE)
+            await session.execute(
+                delete(Community)
+                .where(Community.id == existing.id)
+                .execution_options(synchronize_session=False)
+            )
+
+    inserted = {k: 0 for k in ENTITY_KEYS}
+
+    if dry_run:
+        inserted["community"] = 1
+        inserted["participant"] = len(bundle.participants)
+        inserted["membership"] = len(bundle.memberships)
+        inserted["site"] = len(bundle.sites)
+        inserted["asset"] = len(bundle.assets)
+        inserted["meter"] = sum(
+            1 for m in bundle.meters if m.sensor_id
+        )  # skip placeholders
+        return community_key, deleted, inserted, warnings, None
+
+    # Rows are plain dicts with client-side ids, written with one executemany
+    # INSERT per entity type (no ORM objects or unit-of-work bookkeeping)
+    community_id = uuid.uuid4()
+    community = _community_row(bundle, base_url, community_id)
+    await _insert(session, Community, [{**community, "revision": revision}])
+    inserted["community"] = 1
+
+    rows = _bundle_rows(
+        bundle,
+        base_url=base_url,
+        community_id=community_id,
+        ids={},
+        warnings=warnings,
+    )
+    for name, model in DEPENDENTS.items():
+        await _insert(session, model, rows[name])
+        inserted[name] = len(rows[name])
+
+    await community_changed(session, community_key)
+
+    return community_key, deleted, inserted, warnings, revision
+
+
+async def _update(session: AsyncSession, model, rows: list[dict[str, Any]]) -> None:
+    # executemany UPDATE by primary key; SET covers every other key of the rows
+    if rows:
+        table = model.__table__
+        await session.execute(
+            update(table).where(table.c.id == bindparam("_id")),
+            [
+                {"_id": r["id"], **{k: v for k, v in r.items() if k != "id"}}
+                for r in rows
+            ],
+        )
+
+
+def _changed(row: dict[str, Any], stored: Any) -> bool:
+    return any(stored[k] != v for k, v in row.items())
+
+
+def _natural_keys(model) -> list[tuple[str, ...]]:
+    """
+    Column sets of the unique constraints of ``model`` other than
+    ``(community_id, key)`` (e.g. one membership per participant).
+    """
+    table = model.__table__
+    uniques = [
+        tuple(c.name for c in constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    ]
+    uniques += [tuple(c.name for c in ix.columns) for ix in table.indexes if ix.unique]
+    return [cols for cols in uniques if set(cols) != {"community_id", "key"}]
+
+
+def _cascading(model) -> list[tuple[str, str]]:
+    """
+    ``(column, referenced table)`` of the ON DELETE CASCADE foreign keys of
+    ``model`` to other community dependents.
+    """
+    return [
+        (fk.parent.name, fk.column.table.name)
+        for fk in model.__table__.foreign_keys
+        if fk.ondelete == "CASCADE" and fk.column.table is not Community.__table__
+    ]
+
+
+async def incremental_import_bundle(
+    session: AsyncSession,
+    bundle: RegistryBundleIn,
+    *,
+    base_url: str,
+    dry_run: bool = False,
+) -> tuple[
+    str,
+    dict[str, int],
+    dict[str, int],
+    dict[str, int],
+    dict[str, int],
+    list[str],
+    int | None,
+]:
+    """
+    Diff-based import: bundle entries are matched to stored rows by
+    ``(community_id, key)``; changed rows are updated in place (keeping their
+    ids), new ones inserted and stored rows missing from the bundle deleted.
+
+    The revision is bumped (and caches invalidated) only when something changed.
+    Returns the community key, deleted / inserted / updated / unchanged counts,
+    warnings and the revision (None for dry runs).
+    """
+    community_key = bundle.community.key
+    # Row lock (Postgres) held until commit: concurrent incremental imports of
+    # one community diff and bump the revision one after the other, so two
+    # contents never share a revision (the community id, hence the ETag, is kept)
+    q = select(Community).where(Community.key == community_key)
+    stored_community = await session.scalar(q if dry_run else q.with_for_update())
+    if stored_community is None:
+        key, deleted, inserted, warnings, revision = await replacement_import_bundle(
+            session, bundle, base_url=base_url, dry_run=dry_run
+        )
+        zeros = {k: 0 for k in ENTITY_KEYS}
+        return key, deleted, inserted, zeros, dict(zeros), warnings, revision
+
+    community_id = stored_community.id
+    stored: dict[str, dict[str, Any]] = {}
+    for name, model in DEPENDENTS.items():
+        result = await session.execute(
+            select(model.__table__).where(model.community_id == community_id)
+        )
+        stored[name] = {r.key: r for r in result.mappings()}
+
+    warnings: list[str] = []
+    rows = _bundle_rows(
+        bundle,
+        base_url=base_url,
+        community_id=community_id,
+        ids={name: {k: r["id"] for k, r in s.items()} for name, s in stored.items()},
+        warnings=warnings,
+    )
+
+    deleted = {k: 0 for k in ENTITY_KEYS}
+    inserted = {k: 0 for k in ENTITY_KEYS}
+    updated = {k: 0 for k in ENTITY_KEYS}
+    unchanged = {k: 0 for k in ENTITY_KEYS}
+    new: dict[str, list[dict[str, Any]]] = {}
+    changed: dict[str, list[dict[str, Any]]] = {}
+    stale: dict[str, list[uuid.UUID]] = {}
+    # Kept rows deleted and written back with their ids by the INSERT
+    rewritten: dict[str, list[dict[str, Any]]] = {}
+    # Ids removed by the DELETEs per table, cascades included
+    gone: dict[str, set[uuid.UUID]] = {}
+    for name, model in DEPENDENTS.items():
+        new[name], changed[name], rewritten[name] = [], [], []
+        cascading = _cascading(model)
+        natural = _natural_keys(model)
+        for row in rows[name]:
+            old = stored[name].get(row["key"])
+            if old is None:
+                new[name].append(row)
+            elif any(old[col] in gone.get(table, ()) for col, table in cascading):
+                # Cascaded away with a deleted parent
+                rewritten[name].append(row)
+                updated[name] += _changed(row, old)
+            elif any(row[c] != old[c] for cols in natural for c in cols):
+                # Moved natural key (e.g. memberships swapping participants): an
+                # in-place UPDATE could collide with rows written after it
+                rewritten[name].append(row)
+                updated[name] += 1
+            elif _changed(row, old):
+                changed[name].append(row)
+        keys = {row["key"] for row in rows[name]}
+        stale[name] = [r["id"] for k, r in stored[name].items() if k not in keys]
+        gone[model.__table__.name] = {
+            *stale[name],
+            *(r["id"] for r in rewritten[name]),
+        }
+        inserted[name] = len(new[name])
+        updated[name] += len(changed[name])
+        deleted[name] = len(stale[name])
+        unchanged[name] = len(rows[name]) - inserted[name] - updated[name]
+
+    community = _community_row(bundle, base_url, community_id)
+    dirty = any(getattr(stored_community, k) != v for k, v in community.items())
+    updated["community"] = int(dirty)
+    unchanged["community"] = 1 - updated["community"]
+
+    if dry_run:
+        return community_key, deleted, inserted, updated, unchanged, warnings, None
+    if not dirty and not any(any(d.values()) for d in (new, changed, rewritten, stale)):
+        revision = stored_community.revision
+        return community_key, deleted, inserted, updated, unchanged, warnings, revision
+
+    revision = stored_community.revision + 1
+    await _update(session, Community, [{**community, "revision": revision}])
+    # Stale and rewritten rows go first so that their keys and natural unique
+    # columns (e.g. a membership's participant) are free for the rows written
+    # after them; referencing rows first on the way out, referenced rows first
+    # on the way in
+    for name, model in reversed(DEPENDENTS.items()):
+        ids = [*stale[name], *(r["id"] for r in rewritten[name])]
+        for i in range(0, len(ids), DELETE_BATCH):
+            await session.execute(
+                delete(model)
+                .where(model.id.in_(ids[i : i + DELETE_BATCH]))
+                .execution_options(synchronize_session=False)
+            )
+    for name, model in DEPENDENTS.items():
+        await _insert(session, model, new[name] + rewritten[name])
+        await _update(session, model, changed[name])
+
+    await community_changed(session, community_key)
 
-    return community_key, deleted, inserted, warnings
+    return community_key, deleted, inserted, updated, unchanged, warnings, revision
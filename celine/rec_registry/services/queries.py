@@ -0,0 +1,309 @@
+"""
+Column-projection read queries.
+
+Each list entity is described by the response fields it can emit and the column
+expression behind each field. Queries select only those columns (joined IRIs for
+references included) so rows come back as plain tuples, without ORM identity-map
+bookkeeping or entity hydration.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Any, Sequence
+
+from sqlalchemy import Select, exists, func, literal, select, type_coerce, union_all
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import RowMapping
+
+from celine.rec_registry.db.models import (
+    Community,
+    Participant,
+    Membership,
+    Site,
+    Asset,
+    Meter,
+)
+from celine.rec_registry.db.session import DIALECT
+
+# Response field -> column, in response order. "id" mirrors "iri" and is added
+# when rows are turned into items.
+FIELDS: dict[str, dict[str, Any]] = {
+    "communities": {
+        "key": Community.key,
+        "iri": Community.iri,
+        "name": Community.name,
+        "description": Community.description,
+        "extra": Community.extra,
+    },
+    "participants": {
+        "key": Participant.key,
+        "iri": Participant.iri,
+        "kind": Participant.kind,
+        "name": Participant.name,
+        "auth_iri": Participant.auth_iri,
+        "extra": Participant.extra,
+    },
+    "memberships": {
+        "key": Membership.key,
+        "iri": Membership.iri,
+        "participant": Participant.iri,
+        "role_iri": Membership.role_iri,
+        "status_iri": Membership.status_iri,
+        "valid_from": Membership.valid_from,
+        "valid_to": Membership.valid_to,
+        "extra": Membership.extra,
+    },
+    "sites": {
+        "key": Site.key,
+        "iri": Site.iri,
+        "name": Site.name,
+        "area": Site.area,
+        "extra": Site.extra,
+    },
+    "assets": {
+        "key": Asset.key,
+        "iri": Asset.iri,
+        "owner": Participant.iri,
+        "site": Site.iri,
+        "category_iri": Asset.category_iri,
+        "name": Asset.name,
+        "extra": Asset.extra,
+    },
+    "meters": {
+        "key": Meter.key,
+        "iri": Meter.iri,
+        "owner": Participant.iri,
+        "site": Site.iri,
+        "sensor_id": Meter.sensor_id,
+        "pod": Meter.pod,
+        "name": Meter.name,
+        "extra": Meter.extra,
+    },
+}
+
+# Response fields that are not columns of the entity row
+CONSTANT_FIELDS: dict[str, tuple[str, ...]] = {"memberships": ("community",)}
+
+MODELS = {
+    "communities": Community,
+    "participants": Participant,
+    "memberships": Membership,
+    "sites": Site,
+    "assets": Asset,
+    "meters": Meter,
+}
+
+
+# Entity type names as reported to clients (and in import reports)
+TYPES = {
+    "communities": "community",
+    "participants": "participant",
+    "memberships": "membership",
+    "sites": "site",
+    "assets": "asset",
+    "meters": "meter",
+}
+
+
+def _columns_for(entity: str, selected: tuple[str, ...] | None) -> list[str]:
+    """
+    Projected columns needed to render ``selected`` fields (None: all).
+    """
+    cols = FIELDS[entity]
+    if selected is None:
+        return list(cols)
+    names = [n for n in selected if n in cols]
+    if "id" in selected and "iri" not in names:
+        names.append("iri")
+    return names
+
+
+def projection(entity: str, selected: tuple[str, ...] | None = None) -> Select:
+    """
+    Select the columns behind ``selected`` response fields (default: all) of
+    ``entity``, with the joins its references need.
+    """
+    cols = FIELDS[entity]
+    names = _columns_for(entity, selected)
+    q = select(*(cols[name].label(name) for name in names))
+    model = MODELS[entity]
+    if entity == "memberships":
+        q = q.select_from(Membership).join(
+            Participant, Membership.participant_id == Participant.id
+        )
+    elif entity in ("assets", "meters"):
+        q = (
+            q.select_from(model)
+            .join(Participant, model.owner_participant_id == Participant.id)
+            .outerjoin(Site, model.site_id == Site.id)
+        )
+    else:
+        q = q.select_from(model)
+    return q
+
+
+def community_projection(
+    entity: str, community_id: uuid.UUID, selected: tuple[str, ...] | None = None
+) -> Select:
+    return projection(entity, selected).where(
+        MODELS[entity].community_id == community_id
+    )
+
+
+def select_fields(
+    entity: str, fields: str | None, include_extra: bool = True
+) -> tuple[str, ...] | None:
+    """
+    Response fields requested through ``?fields=`` and ``?include_extra=``.
+
+    Returns None when the full representation is requested. ``key`` is always
+    part of a sparse selection since it is the pagination position.
+
+    Raises:
+        ValueError: if ``fields`` names a field the entity does not have.
+    """
+    if fields is None and include_extra:
+        return None
+    available = ("id", *FIELDS[entity], *CONSTANT_FIELDS.get(entity, ()))
+    if fields:
+        names = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [n for n in names if n not in available]
+        if unknown:
+            raise ValueError(
+                f"Unknown field(s) for {entity}: {', '.join(unknown)}; "
+                f"available: {', '.join(available)}"
+            )
+    else:
+        names = list(available)
+    if not include_extra:
+        names = [n for n in names if n != "extra"]
+    if "key" not in names:
+        names.insert(0, "key")
+    return tuple(dict.fromkeys(names))
+
+
+def extra_document(filters: Sequence[tuple[str, str]]) -> dict[str, Any]:
+    """
+    JSON document that ``extra`` must contain for ``(path, value)`` filters.
+
+    Paths are dot-separated keys; a segment ending in ``[]`` is an array and
+    matches any element. Filters going through the same array path constrain the
+    same element: ``datasets[].id=a`` and ``datasets[].kind=b`` match a dataset
+    with both. Values are compared as strings.
+
+    Raises:
+        ValueError: on an empty path segment or conflicting values for one path.
+    """
+    doc: dict[str, Any] = {}
+    for path, value in filters:
+        segments = path.split(".")
+        node: Any = doc
+        for i, segment in enumerate(segments):
+            is_array = segment.endswith("[]")
+            name = segment[:-2] if is_array else segment
+            if not name:
+                raise ValueError(f"Invalid extra filter path: {path!r}")
+            last = i == len(segments) - 1
+            if last and not is_array:
+                if node.get(name, value) != value:
+                    raise ValueError(f"Conflicting values for extra.{path}")
+                node[name] = value
+                break
+            child = node.setdefault(name, [] if is_array else {})
+            if not isinstance(child, list if is_array else dict):
+                raise ValueError(f"Conflicting extra filter paths at {path!r}")
+            if is_array:
+                if last:
+                    if value not in child:
+                        child.append(value)
+                    break
+                if not child or not isinstance(child[0], dict):
+                    child.insert(0, {})
+                node = child[0]
+            else:
+                node = child
+    return doc
+
+
+def _json_path(keys: Sequence[str]) -> str:
+    return "$" + "".join(f'."{k}"' for k in keys)
+
+
+def _json_contains(col: Any, doc: dict[str, Any], prefix: tuple[str, ...] = ()):
+    """
+    SQLite conditions equivalent to ``col @> doc``: ``json_extract`` per scalar,
+    an ``EXISTS`` over ``json_each`` per array element.
+    """
+    conds = []
+    for name, value in doc.items():
+        path = (*prefix, name)
+        if isinstance(value, dict):
+            conds += _json_contains(col, value, path)
+        elif isinstance(value, list):
+            for element in value:
+                each = func.json_each(col, _json_path(path)).table_valued("value")
+                if isinstance(element, dict):
+                    where = _json_contains(each.c.value, element)
+                else:
+                    where = [each.c.value == element]
+                conds.append(exists().select_from(each).where(*where))
+        else:
+            conds.append(func.json_extract(col, _json_path(path)) == value)
+    return conds
+
+
+def where_extra(q: Select, entity: str, filters: Sequence[tuple[str, str]]) -> Select:
+    """
+    Restrict ``q`` to ``entity`` rows whose ``extra`` contains the filter document
+    (``@>`` on Postgres, served by the GIN index on ``extra``).
+    """
+    if not filters:
+        return q
+    doc = extra_document(filters)
+    extra = MODELS[entity].extra
+    if DIALECT == "postgresql":
+        return q.where(type_coerce(extra, JSONB).contains(doc))
+    return q.where(*_json_contains(extra, doc))
+
+
+def to_items(
+    rows: Sequence[RowMapping],
+    selected: tuple[str, ...] | None = None,
+    **constant: Any,
+) -> list[dict[str, Any]]:
+    """
+    Turn projected rows into response items (``id`` first, then the projected fields).
+
+    With a sparse ``selected`` tuple only those fields are emitted, in that order.
+    """
+    if selected is None:
+        return [{"id": r["iri"], **r, **constant} for r in rows]
+    return [
+        {
+            f: r["iri"] if f == "id" else constant[f] if f in constant else r[f]
+            for f in selected
+        }
+        for r in rows
+    ]
+
+
+def iri_locator(iris: Sequence[str]):
+    """
+    One UNION ALL over every entity table matching ``iris`` through the iri indexes.
+
+    Rows: ``entity`` (plural), ``type``, ``community`` (key), ``id`` and ``iri``.
+    """
+    parts = []
+    for entity, model in MODELS.items():
+        q = select(
+            literal(entity).label("entity"),
+            literal(TYPES[entity]).label("type"),
+            Community.key.label("community"),
+            model.id.label("id"),
+            model.iri.label("iri"),
+        )
+        if model is not Community:
+            q = q.select_from(model).join(Community, model.community_id == Community.id)
+        parts.append(q.where(model.iri.in_(iris)))
+    return union_all(*parts)
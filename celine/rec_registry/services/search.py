@@ -0,0 +1,91 @@
+"""
+Substring search over entity names, areas, keys and POD codes.
+
+Matching is ``ILIKE '%q%'``, served by pg_trgm GIN indexes on every searched
+column, so it stays index-driven across all communities. Hits are ranked by
+match quality (exact > prefix > substring) and paged by a keyset over
+``(score DESC, type, iri)``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from sqlalchemy import Select, and_, case, func, literal, or_, select, union_all
+
+from celine.rec_registry.db.models import Community, Meter, Participant, Site
+
+# Entity type -> (model, searched columns)
+SEARCHABLE: dict[str, tuple[Any, tuple[str, ...]]] = {
+    "participant": (Participant, ("name", "key")),
+    "site": (Site, ("name", "area", "key")),
+    "meter": (Meter, ("name", "key", "pod")),
+}
+
+# Minimum query length: shorter patterns cannot use the trigram indexes
+MIN_QUERY_LENGTH = 3
+
+SCORE_EXACT = 3
+SCORE_PREFIX = 2
+SCORE_SUBSTRING = 1
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _branch(type_: str, text: str) -> Select:
+    model, names = SEARCHABLE[type_]
+    cols = [getattr(model, n) for n in names]
+    escaped = _escape_like(text)
+    needle = text.lower()
+    score = case(
+        (or_(*(func.lower(c) == needle for c in cols)), SCORE_EXACT),
+        (or_(*(c.ilike(f"{escaped}%", escape="\\") for c in cols)), SCORE_PREFIX),
+        else_=SCORE_SUBSTRING,
+    )
+    return (
+        select(
+            literal(type_).label("type"),
+            Community.key.label("community"),
+            model.key.label("key"),
+            model.iri.label("iri"),
+            model.name.label("name"),
+            score.label("score"),
+        )
+        .select_from(model)
+        .join(Community, model.community_id == Community.id)
+        .where(or_(*(c.ilike(f"%{escaped}%", escape="\\") for c in cols)))
+    )
+
+
+def search_query(
+    text: str,
+    types: Sequence[str],
+    *,
+    limit: int,
+    after: tuple[int, str, str] | None = None,
+) -> Select:
+    """
+    Ranked hits for ``text`` among entities of ``types`` (``SEARCHABLE`` keys).
+
+    ``after`` is the ``(score, type, iri)`` of the last hit of the previous page.
+    One extra row is fetched so the caller can tell whether a next page exists.
+    """
+    hits = union_all(*(_branch(t, text) for t in types)).subquery("hits")
+    q = select(hits)
+    if after is not None:
+        score, type_, iri = after
+        q = q.where(
+            or_(
+                hits.c.score < score,
+                and_(
+                    hits.c.score == score,
+                    or_(
+                        hits.c.type > type_,
+                        and_(hits.c.type == type_, hits.c.iri > iri),
+                    ),
+                ),
+            )
+        )
+    return q.order_by(hits.c.score.desc(), hits.c.type, hits.c.iri).limit(limit + 1)
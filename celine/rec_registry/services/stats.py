@@ -0,0 +1,75 @@
+"""
+Per-community aggregate counts for dashboards.
+
+All groupings come from one UNION ALL of grouped counts over the
+``community_id`` indexes: a single round trip, whatever the community size.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+from sqlalchemy import String, func, literal, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from celine.rec_registry.db.models import Asset, Membership, Meter, Participant, Site
+
+# Group name -> (model, grouped column or None for a plain count, response value name)
+GROUPS: dict[str, tuple[Any, Any, str | None]] = {
+    "participants_by_kind": (Participant, Participant.kind, "kind"),
+    "memberships_by_status": (Membership, Membership.status_iri, "status_iri"),
+    "sites": (Site, None, None),
+    "assets_by_category": (Asset, Asset.category_iri, "category_iri"),
+    "meters_by_site": (Meter, Site.iri, "site"),
+}
+
+# Totals are the sum of each entity's group counts
+TOTALS = {
+    "participants": "participants_by_kind",
+    "memberships": "memberships_by_status",
+    "sites": "sites",
+    "assets": "assets_by_category",
+    "meters": "meters_by_site",
+}
+
+
+def _stats_query(community_id: uuid.UUID):
+    parts = []
+    for name, (model, col, _) in GROUPS.items():
+        value = null().cast(String) if col is None else col.cast(String)
+        q = select(
+            literal(name).label("stat"),
+            value.label("value"),
+            func.count().label("count"),
+        ).select_from(model)
+        if model is Meter:
+            q = q.outerjoin(Site, Meter.site_id == Site.id)
+        q = q.where(model.community_id == community_id)
+        if col is not None:
+            q = q.group_by(col)
+        parts.append(q)
+    return union_all(*parts)
+
+
+async def community_stats(
+    session: AsyncSession, community_id: uuid.UUID
+) -> dict[str, Any]:
+    """
+    Entity totals plus participants by kind, memberships by status, assets by
+    category and meters per site (``null`` groups unset values).
+    """
+    counts: dict[str, int] = {name: 0 for name in GROUPS}
+    groups: dict[str, list[dict[str, Any]]] = {
+        name: [] for name, (_, col, _) in GROUPS.items() if col is not None
+    }
+    rows = (await session.execute(_stats_query(community_id))).all()
+    # Largest groups first, then by value
+    for r in sorted(rows, key=lambda r: (-r.count, r.value or "")):
+        counts[r.stat] += r.count
+        if r.stat in groups:
+            groups[r.stat].append({GROUPS[r.stat][2]: r.value, "count": r.count})
+    return {
+        "totals": {entity: counts[group] for entity, group in TOTALS.items()},
+        **groups,
+    }
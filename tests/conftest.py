@@ -0,0 +1,75 @@
+"""
+Tests run the whole application in-process against a private in-memory SQLite
+database (``TEST_DATABASE_URL`` selects another one, e.g. Postgres).
+"""
+
+import os
+
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("COMMUNITY_CACHE_BUS", "local")
+
+from typing import Any  # noqa: E402
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from celine.rec_registry.main import app  # noqa: E402
+
+
+def make_bundle(key: str, participants: int = 3, meters: int = 4) -> dict[str, Any]:
+    """
+    A small valid bundle: one membership per participant, two sites, one asset
+    and ``meters`` meters spread over the participants.
+    """
+    p_keys = [f"p{i}" for i in range(participants)]
+    return {
+        "context": {
+            "base": f"https://registry.example.org/{key}/",
+            "prefixes": {"celine": "https://celine-eu.github.io/ontologies/celine#"},
+        },
+        "community": {"key": key, "name": f"REC {key}", "description": "Test REC"},
+        "participants": [
+            {"key": k, "kind": "household", "name": f"Participant {k}"} for k in p_keys
+        ],
+        "memberships": [
+            {"key": f"mb-{k}", "participant": k, "role": "celine:Consumer"}
+            for k in p_keys
+        ],
+        "sites": [{"key": "s0", "name": "Site 0"}, {"key": "s1", "name": "Site 1"}],
+        "assets": [
+            {
+                "key": "a0",
+                "owner": {"kind": "participant", "ref": p_keys[0]},
+                "located_at": "s0",
+                "category": "celine:PV",
+            }
+        ],
+        "meters": [
+            {
+                "key": f"m{i}",
+                "owner": {"kind": "participant", "ref": p_keys[i % participants]},
+                "located_at": f"s{i % 2}",
+                "sensor_id": f"{key}-sensor-{i}",
+            }
+            for i in range(meters)
+        ],
+    }
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def client(anyio_backend):
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+
+
+async def import_bundle(client: httpx.AsyncClient, bundle: dict, **options) -> dict:
+    r = await client.post("/admin/import", json={"bundle": bundle, **options})
+    assert r.status_code == 200, r.text
+    return r.json()
@@ -0,0 +1,69 @@
+"""
+Community key resolution cache.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import update
+
+from celine.rec_registry.db.models import Community
+from celine.rec_registry.db.session import SessionLocal
+from celine.rec_registry.services.community_cache import (
+    CommunityCache,
+    CommunityRef,
+    community_cache,
+    resolve_community,
+)
+from conftest import import_bundle, make_bundle
+
+pytestmark = pytest.mark.anyio
+
+
+def _ref(revision: int = 1) -> CommunityRef:
+    return CommunityRef(id=uuid.uuid4(), key="c", iri="urn:c", revision=revision)
+
+
+def test_put_after_invalidation_is_dropped():
+    cache = CommunityCache(max_entries=10, ttl=60)
+    generation = cache.generation("c")
+    cache.invalidate("c")
+    cache.put(_ref(), generation=generation)
+    assert cache.get("c") is None
+
+    cache.put(_ref(2), generation=cache.generation("c"))
+    assert cache.get("c").revision == 2
+
+
+def test_put_after_clear_is_dropped():
+    cache = CommunityCache(max_entries=10, ttl=60)
+    generation = cache.generation("c")
+    cache.clear()
+    cache.put(_ref(), generation=generation)
+    assert cache.get("c") is None
+
+
+async def test_lookup_racing_an_import_is_not_cached(client):
+    await import_bundle(client, make_bundle("cache-race"))
+    community_cache.invalidate("cache-race")
+
+    class RacingSession:
+        # Reads the community, then an import commits before the result is cached
+        info = {}
+
+        async def execute(self, statement):
+            async with SessionLocal() as session:
+                result = await session.execute(statement)
+            async with SessionLocal() as session, session.begin():
+                await session.execute(
+                    update(Community)
+                    .where(Community.key == "cache-race")
+                    .values(revision=Community.revision + 1)
+                )
+            community_cache.invalidate("cache-race")
+            return result
+
+    stale = await resolve_community(RacingSession(), "cache-race")
+    async with SessionLocal() as session:
+        fresh = await resolve_community(session, "cache-race")
+    assert fresh.revision == stale.revision + 1
@@ -0,0 +1,42 @@
+"""
+Revision ETags and conditional requests on community-scoped reads.
+"""
+
+import pytest
+
+from conftest import import_bundle, make_bundle
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="module")
+async def community(client):
+    await import_bundle(client, make_bundle("etags"))
+    return "etags"
+
+
+@pytest.mark.parametrize("path", ["/communities/etags", "/communities/etags/meters"])
+@pytest.mark.parametrize("fmt", ["json", "jsonld"])
+async def test_etag_is_stable_and_revalidates(client, community, path, fmt):
+    miss = await client.get(path, params={"format": fmt})
+    hit = await client.get(path, params={"format": fmt})
+    assert miss.status_code == hit.status_code == 200
+    assert miss.headers["etag"] == hit.headers["etag"]
+
+    r = await client.get(
+        path, params={"format": fmt}, headers={"If-None-Match": miss.headers["etag"]}
+    )
+    assert r.status_code == 304
+
+
+async def test_formats_have_distinct_etags(client, community):
+    json = await client.get("/communities/etags", params={"format": "json"})
+    jsonld = await client.get("/communities/etags", params={"format": "jsonld"})
+    assert json.headers["etag"] != jsonld.headers["etag"]
+
+
+async def test_min_revision_header_is_validated(client, community):
+    r = await client.get("/communities/etags", headers={"X-Min-Revision": "latest"})
+    assert r.status_code == 400
+    r = await client.get("/communities/etags", headers={"X-Min-Revision": "1"})
+    assert r.status_code == 200
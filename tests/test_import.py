@@ -0,0 +1,168 @@
+"""
+Incremental (diff-based) imports.
+"""
+
+import asyncio
+import copy
+
+import pytest
+
+from celine.rec_registry.db.session import DIALECT
+
+from conftest import import_bundle, make_bundle
+
+pytestmark = pytest.mark.anyio
+
+
+async def _items(client, key: str, collection: str) -> dict[str, dict]:
+    r = await client.get(f"/communities/{key}/{collection}", params={"limit": 500})
+    assert r.status_code == 200, r.text
+    return {item["key"]: item for item in r.json()["items"]}
+
+
+async def test_unchanged_bundle_keeps_revision(client):
+    bundle = make_bundle("inc-same")
+    first = await import_bundle(client, bundle)
+    again = await import_bundle(client, bundle, mode="incremental")
+    assert again["revision"] == first["revision"]
+    assert not any(again["inserted"].values())
+    assert not any(again["updated"].values())
+    assert not any(again["deleted"].values())
+    assert again["unchanged"]["meter"] == 4
+
+
+async def test_changed_rows_keep_their_ids(client):
+    bundle = make_bundle("inc-update")
+    first = await import_bundle(client, bundle)
+    before = await _items(client, "inc-update", "meters")
+
+    bundle = copy.deepcopy(bundle)
+    bundle["meters"][1]["sensor_id"] = "inc-update-replaced"
+    report = await import_bundle(client, bundle, mode="incremental")
+    assert report["revision"] == first["revision"] + 1
+    assert report["updated"]["meter"] == 1
+    assert report["unchanged"]["meter"] == 3
+
+    after = await _items(client, "inc-update", "meters")
+    assert after["m1"]["sensor_id"] == "inc-update-replaced"
+    assert {k: m["iri"] for k, m in after.items()} == {
+        k: m["iri"] for k, m in before.items()
+    }
+
+
+async def test_renamed_key_frees_natural_unique_columns(client):
+    # (community, participant) is unique for memberships: the renamed row can
+    # only be written once the old one is gone
+    bundle = make_bundle("inc-rename")
+    await import_bundle(client, bundle)
+
+    bundle = copy.deepcopy(bundle)
+    bundle["memberships"][0]["key"] = "mb-renamed"
+    bundle["meters"][0]["key"] = "m-renamed"
+    report = await import_bundle(client, bundle, mode="incremental")
+    assert report["deleted"]["membership"] == 1
+    assert report["inserted"]["membership"] == 1
+    assert report["deleted"]["meter"] == 1
+    assert report["inserted"]["meter"] == 1
+
+    memberships = await _items(client, "inc-rename", "memberships")
+    assert "mb-renamed" in memberships and "mb-p0" not in memberships
+    assert "m-renamed" in await _items(client, "inc-rename", "meters")
+
+
+async def test_memberships_swapping_participants(client):
+    bundle = make_bundle("inc-swap")
+    await import_bundle(client, bundle)
+    before = await _items(client, "inc-swap", "memberships")
+
+    bundle = copy.deepcopy(bundle)
+    bundle["memberships"][0]["participant"] = "p1"
+    bundle["memberships"][1]["participant"] = "p0"
+    report = await import_bundle(client, bundle, mode="incremental")
+    assert report["updated"]["membership"] == 2
+    assert report["unchanged"]["membership"] == 1
+
+    after = await _items(client, "inc-swap", "memberships")
+    assert after["mb-p0"]["participant"].endswith("/participants/p1")
+    assert after["mb-p1"]["participant"].endswith("/participants/p0")
+    assert after["mb-p0"]["iri"] == before["mb-p0"]["iri"]
+
+
+async def test_new_membership_takes_over_a_participant(client):
+    bundle = make_bundle("inc-takeover")
+    await import_bundle(client, bundle)
+
+    bundle = copy.deepcopy(bundle)
+    bundle["participants"].append({"key": "p9", "kind": "household"})
+    bundle["memberships"][0]["participant"] = "p9"
+    bundle["memberships"].append({"key": "mb-new", "participant": "p0"})
+    report = await import_bundle(client, bundle, mode="incremental")
+    assert report["inserted"]["membership"] == 1
+    assert report["updated"]["membership"] == 1
+
+    after = await _items(client, "inc-takeover", "memberships")
+    assert after["mb-p0"]["participant"].endswith("/participants/p9")
+    assert after["mb-new"]["participant"].endswith("/participants/p0")
+
+
+async def test_rows_moved_off_a_removed_participant_survive(client):
+    # Removing p0 cascades to everything it owns in the database; rows the
+    # bundle moves to another owner must be written back
+    bundle = make_bundle("inc-reown")
+    await import_bundle(client, bundle)
+    before = await _items(client, "inc-reown", "meters")
+
+    bundle = copy.deepcopy(bundle)
+    del bundle["participants"][0]
+    del bundle["memberships"][0]
+    bundle["assets"][0]["owner"]["ref"] = "p1"
+    bundle["meters"][0]["owner"]["ref"] = "p1"
+    bundle["meters"][3]["owner"]["ref"] = "p2"
+    report = await import_bundle(client, bundle, mode="incremental")
+    assert report["deleted"]["participant"] == 1
+    assert report["deleted"]["membership"] == 1
+    assert report["updated"]["asset"] == 1
+    assert report["updated"]["meter"] == 2
+
+    after = await _items(client, "inc-reown", "meters")
+    assert set(after) == set(before)
+    assert {k: m["iri"] for k, m in after.items()} == {
+        k: m["iri"] for k, m in before.items()
+    }
+    assert after["m0"]["owner"].endswith("/participants/p1")
+    assert after["m3"]["owner"].endswith("/participants/p2")
+    assert list(await _items(client, "inc-reown", "assets")) == ["a0"]
+
+
+async def test_dry_run_writes_nothing(client):
+    bundle = make_bundle("inc-dry")
+    await import_bundle(client, bundle)
+    etag = (await client.get("/communities/inc-dry")).headers["etag"]
+
+    bundle = copy.deepcopy(bundle)
+    del bundle["meters"][0]
+    report = await import_bundle(client, bundle, mode="incremental", dry_run=True)
+    assert report["deleted"]["meter"] == 1
+    assert report["revision"] is None
+
+    assert "m0" in await _items(client, "inc-dry", "meters")
+    assert (await client.get("/communities/inc-dry")).headers["etag"] == etag
+
+
+@pytest.mark.skipif(
+    DIALECT != "postgresql", reason="SQLite serializes writers by locking the database"
+)
+async def test_concurrent_imports_get_distinct_revisions(client):
+    bundle = make_bundle("inc-concurrent")
+    first = await import_bundle(client, bundle)
+    variants = []
+    for sensor_id in ("first", "second"):
+        variant = copy.deepcopy(bundle)
+        variant["meters"][0]["sensor_id"] = sensor_id
+        variants.append(variant)
+
+    reports = await asyncio.gather(
+        *(import_bundle(client, v, mode="incremental") for v in variants)
+    )
+    revision = first["revision"]
+    assert sorted(r["revision"] for r in reports) == [revision + 1, revision + 2]
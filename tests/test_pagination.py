@@ -0,0 +1,73 @@
+"""
+Keyset pagination cursors.
+"""
+
+import pytest
+
+from celine.rec_registry.core.settings import DEFAULT_CURSOR_SECRET, settings
+from celine.rec_registry.main import check_settings
+from conftest import import_bundle, make_bundle
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="module")
+async def communities(client):
+    for key in ("pages-a", "pages-b"):
+        await import_bundle(client, make_bundle(key, meters=7))
+    return "pages-a", "pages-b"
+
+
+async def test_walk_returns_every_row_once(client, communities):
+    keys, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        r = await client.get("/communities/pages-a/meters", params=params)
+        assert r.status_code == 200, r.text
+        body = r.json()
+        keys += [item["key"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert keys == sorted(f"m{i}" for i in range(7))
+
+
+async def _first_cursor(client, path: str, **params) -> str:
+    r = await client.get(path, params={"limit": 2, **params})
+    assert r.status_code == 200, r.text
+    return r.json()["next_cursor"]
+
+
+async def test_cursor_is_bound_to_its_community(client, communities):
+    cursor = await _first_cursor(client, "/communities/pages-a/meters")
+    r = await client.get("/communities/pages-b/meters", params={"cursor": cursor})
+    assert r.status_code == 400
+
+
+async def test_cursor_is_bound_to_its_filters(client, communities):
+    cursor = await _first_cursor(client, "/communities/pages-a/meters", site="s0")
+    r = await client.get(
+        "/communities/pages-a/meters", params={"cursor": cursor, "site": "s0"}
+    )
+    assert r.status_code == 200
+    r = await client.get(
+        "/communities/pages-a/meters", params={"cursor": cursor, "site": "s1"}
+    )
+    assert r.status_code == 400
+
+
+async def test_cursor_is_bound_to_its_collection(client, communities):
+    cursor = await _first_cursor(client, "/communities/pages-a/participants")
+    r = await client.get("/communities/pages-a/sites", params={"cursor": cursor})
+    assert r.status_code == 400
+
+
+def test_default_cursor_secret_is_reported(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "cursor_secret", DEFAULT_CURSOR_SECRET)
+    check_settings()
+    assert "CURSOR_SECRET" in caplog.text
+
+    caplog.clear()
+    monkeypatch.setattr(settings, "cursor_secret", "private")
+    check_settings()
+    assert "CURSOR_SECRET" not in caplog.text
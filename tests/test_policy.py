@@ -0,0 +1,117 @@
+"""
+Decision cache in front of the access policy.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from starlette.requests import Request
+
+from celine.rec_registry.core.middleware import PolicyMiddleware
+from celine.rec_registry.core.policy import AccessPolicy, CachedAccessPolicy, Decision
+from celine.rec_registry.main import app
+
+pytestmark = pytest.mark.anyio
+
+
+class SlowPolicy(AccessPolicy):
+    def __init__(self, result: Decision | Exception = Decision(True)):
+        self.calls = 0
+        self.result = result
+        self.release = asyncio.Event()
+
+    async def allow_write(self, request: Request) -> Decision:
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def _request(token: str = "t") -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "scheme": "http",
+            "server": ("test", 80),
+            "path": "/admin/import",
+            "query_string": b"",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+    )
+
+
+async def test_concurrent_checks_share_one_upstream_call():
+    upstream = SlowPolicy()
+    policy = CachedAccessPolicy(upstream)
+    checks = [asyncio.create_task(policy.allow_write(_request())) for _ in range(3)]
+    await asyncio.sleep(0)
+    upstream.release.set()
+    assert [d.allowed for d in await asyncio.gather(*checks)] == [True] * 3
+    assert upstream.calls == 1
+    assert (await policy.allow_write(_request())).allowed
+    assert upstream.calls == 1
+
+
+async def test_cancelled_leader_does_not_fail_waiters():
+    upstream = SlowPolicy()
+    policy = CachedAccessPolicy(upstream)
+    leader = asyncio.create_task(policy.allow_write(_request()))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(policy.allow_write(_request()))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    upstream.release.set()
+    assert (await waiter).allowed
+    assert upstream.calls == 1
+    # The decision was cached, not the cancellation
+    assert (await policy.allow_write(_request())).allowed
+    assert upstream.calls == 1
+
+
+async def test_upstream_errors_reach_every_waiter_and_are_not_cached():
+    upstream = SlowPolicy(RuntimeError("introspection down"))
+    policy = CachedAccessPolicy(upstream)
+    checks = [asyncio.create_task(policy.allow_write(_request())) for _ in range(2)]
+    await asyncio.sleep(0)
+    upstream.release.set()
+    for check in checks:
+        with pytest.raises(RuntimeError):
+            await check
+    assert upstream.calls == 1
+
+    upstream.result = Decision(False, "denied")
+    assert not (await policy.allow_write(_request())).allowed
+    assert upstream.calls == 2
+
+
+class DenyWrites(AccessPolicy):
+    async def allow_write(self, request: Request) -> Decision:
+        return Decision(False, "read-only client")
+
+
+@pytest.fixture
+async def read_only_client(client):
+    transport = httpx.ASGITransport(app=PolicyMiddleware(app, policy=DenyWrites()))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [("/resolve", {"iris": ["urn:x"]}), ("/meters/resolve", {"sensor_ids": ["x"]})],
+)
+async def test_batch_lookups_are_reads(read_only_client, path, body):
+    r = await read_only_client.post(path, json=body)
+    assert r.status_code == 200, r.text
+
+
+async def test_other_posts_need_write_access(read_only_client):
+    r = await read_only_client.post("/communities", json={})
+    assert r.status_code == 403
+    assert r.json()["detail"] == "read-only client"
@@ -0,0 +1,41 @@
+"""
+Batch resolution endpoints.
+"""
+
+import pytest
+
+from celine.rec_registry.schemas.resolve import MAX_ITEMS
+from conftest import import_bundle, make_bundle
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_meters_resolve(client):
+    await import_bundle(client, make_bundle("resolve"))
+    r = await client.post(
+        "/meters/resolve", json={"sensor_ids": ["resolve-sensor-1", "unknown"]}
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert [m["key"] for m in body["sensor_ids"]["resolve-sensor-1"]] == ["m1"]
+    assert body["misses"]["sensor_ids"] == ["unknown"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"sensor_ids": ["s"] * (MAX_ITEMS + 1)},
+        {"pods": ["p"] * (MAX_ITEMS + 1)},
+        {"sensor_ids": ["s"] * MAX_ITEMS, "pods": ["p"]},
+    ],
+)
+async def test_meters_resolve_rejects_oversized_batches(client, body):
+    r = await client.post("/meters/resolve", json=body)
+    assert r.status_code == 422
+
+
+async def test_iri_resolve_rejects_oversized_batches(client):
+    r = await client.post("/resolve", json={"iris": ["urn:x"] * (MAX_ITEMS + 1)})
+    assert r.status_code == 422
+    r = await client.post("/resolve", json={"iris": ["urn:x"] * MAX_ITEMS})
+    assert r.status_code == 200
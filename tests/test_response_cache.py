@@ -0,0 +1,33 @@
+"""
+Response cache accounting.
+"""
+
+import pytest
+
+from celine.rec_registry.core.settings import settings
+from celine.rec_registry.services.response_cache import response_cache
+from conftest import import_bundle, make_bundle
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "max_bytes", 1 << 20)
+    monkeypatch.setattr(response_cache, "hits", 0)
+    monkeypatch.setattr(response_cache, "misses", 0)
+    yield response_cache
+    response_cache.clear()
+
+
+async def test_compressed_hits_count_once(client, cache, monkeypatch):
+    monkeypatch.setattr(settings, "compression_min_size", 1)
+    await import_bundle(client, make_bundle("cache-stats", meters=20))
+    path = "/communities/cache-stats/meters"
+    headers = {"Accept-Encoding": "gzip"}
+    for _ in range(3):
+        r = await client.get(path, headers=headers)
+        assert r.status_code == 200
+    # One miss rendering the body, then one hit per request; compressing the
+    # cached body and reusing the compressed variant are not lookups of their own
+    assert (cache.misses, cache.hits) == (1, 2)
@@ -0,0 +1,51 @@
+"""
+Routes that open a second session next to the request's (graph snapshots,
+streams, RDF exports) on the in-memory SQLite database.
+"""
+
+import asyncio
+
+import pytest
+
+from conftest import import_bundle, make_bundle
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="module")
+async def community(client):
+    await import_bundle(client, make_bundle("sqlite-streams"))
+    return "sqlite-streams"
+
+
+async def test_graph(client, community):
+    r = await client.get(f"/communities/{community}/graph")
+    assert r.status_code == 200, r.text
+    assert len(r.json()["meters"]) == 4
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "nt", "ttl", "jsonld-expanded"])
+async def test_streamed_list(client, community, fmt):
+    r = await client.get(f"/communities/{community}/meters", params={"format": fmt})
+    assert r.status_code == 200, r.text
+    assert f"{community}/meters/m3" in r.text
+
+
+@pytest.mark.parametrize("fmt", ["yaml", "nt"])
+async def test_export(client, community, fmt):
+    r = await client.get(
+        "/admin/export", params={"community": community, "format": fmt}
+    )
+    assert r.status_code == 200, r.text
+    assert "m3" in r.text
+
+
+async def test_concurrent_streams(client, community):
+    async def ndjson() -> int:
+        r = await client.get(
+            f"/communities/{community}/participants", params={"format": "ndjson"}
+        )
+        assert r.status_code == 200, r.text
+        return r.text.count("\n")
+
+    assert await asyncio.gather(ndjson(), ndjson(), ndjson()) == [3, 3, 3]